@@ -0,0 +1,87 @@
+from comps.engine import call_spec, invoke
+from typing import Callable, Any, List, Tuple, Dict, AsyncIterator
+import asyncio
+import inspect
+
+async def async_zip(sources: List[Any]) -> AsyncIterator[Tuple[Any, ...]]:
+    """
+    Zips async and plain iterables, stopping at the shortest.
+    """
+    iterators = [source.__aiter__() if hasattr(source, "__aiter__") else iter(source) for source in sources]
+    if not iterators:
+        return
+    while True:
+        values = []
+        for iterator in iterators:
+            try:
+                if hasattr(iterator, "__anext__"):
+                    values.append(await iterator.__anext__())
+                else:
+                    values.append(next(iterator))
+            except (StopIteration, StopAsyncIteration):
+                return
+        yield tuple(values)
+
+def bind(function: Callable[..., Any], names: List[str]) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Returns `call(env)` that awaits `function` with the names it takes, whether it is a
+    coroutine function or a plain one.
+    """
+    spec = call_spec(function, names)
+
+    async def call(env: Dict[str, Any]) -> Any:
+        value = invoke(function, spec, env)
+        if inspect.isawaitable(value):
+            value = await value
+        return value
+    return call
+
+async def map_tasks(
+    items: AsyncIterator[Any],
+    function: Callable[[Any], Any],
+    concurrency: int,
+    *,
+    ordered: bool = True
+) -> AsyncIterator[Any]:
+    """
+    Runs `function(item)` as tasks, at most `concurrency` running or waiting to be yielded.
+    Yields results in input order, or as they complete when not `ordered`.
+    A failing task cancels the others and the error is raised at once; so does closing
+    the generator early.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer.")
+    running = {}
+    finished = {}
+    next_index = 0
+    index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(running) + len(finished) < concurrency:
+                try:
+                    item = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                running[asyncio.ensure_future(function(item))] = index
+                index += 1
+            if next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+                continue
+            if not running:
+                return
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                position = running.pop(task)
+                result = task.result()
+                if ordered:
+                    finished[position] = result
+                else:
+                    yield result
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
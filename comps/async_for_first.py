@@ -0,0 +1,51 @@
+from comps.async_engine import async_zip, bind, map_tasks
+from comps.engine import always_true
+from typing import Iterable, Callable, Any, List, Tuple, Optional
+
+async def async_for_first(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    *,
+    when: Callable[..., bool] = always_true,
+    concurrency: int = 1
+) -> Optional[Any]:
+    """
+    Returns the body value for the first element (in input order) that satisfies `when`.
+    Up to `concurrency` `when` checks run at once; outstanding ones are cancelled as soon
+    as the first hit is known. `body` is called only for that element.
+    """
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+    call_body = bind(body, iterable_names)
+    call_when = bind(when, iterable_names)
+
+    async def check(values):
+        env = dict(zip(iterable_names, values))
+        return env, await call_when(env)
+
+    checks = map_tasks(async_zip(iterable_values), check, concurrency)
+    try:
+        async for env, hit in checks:
+            if hit:
+                break
+        else:
+            return None
+    finally:
+        await checks.aclose()
+    return await call_body(env)
+
+# Example usage
+if __name__ == "__main__":
+    import asyncio
+
+    async def is_even(n):
+        await asyncio.sleep(0.01)
+        return n % 2 == 0
+
+    first_even_square = asyncio.run(async_for_first(
+        iterables=[("n", [1, 3, 5, 6, 7, 8])],
+        body=lambda n: n * n,
+        when=is_even,
+        concurrency=4
+    ))
+    print(f"First even square: {first_even_square}")  # Output: First even square: 36
@@ -0,0 +1,67 @@
+from comps.async_engine import async_zip, bind
+from comps.collector import initial_values, final_env
+from comps.engine import always_true, apply_updates, call_with
+from typing import Callable, Any, Iterable, List, Tuple
+
+_SKIP = object()  # collector left out of a dict update
+
+async def async_for_fold(
+    accumulators: List[Tuple[str, Any]],
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Tuple[Any, ...]],
+    *,
+    when: Callable[..., bool] = always_true,
+    result: Callable[..., Any] = None
+) -> Any:
+    """
+    Async for_fold over async or plain iterables; `body` and `when` may be coroutine functions.
+    Steps run one at a time, since each depends on the accumulators of the previous one.
+    """
+    accumulator_names = [name for name, _ in accumulators]
+    iterable_names = [name for name, _ in iterables]
+    names = accumulator_names + iterable_names
+    call_body = bind(body, names)
+    call_when = None if when is always_true else bind(when, names)
+
+    values, collectors = initial_values(accumulators)
+    env = dict(zip(accumulator_names, values))
+    async for bound in async_zip([iterable for _, iterable in iterables]):
+        current_vars = {**env, **dict(zip(iterable_names, bound))}
+        if call_when is not None and not await call_when(current_vars):
+            continue
+        current = tuple(_SKIP if collector else env[name] for name, collector in zip(accumulator_names, collectors))
+        updates = apply_updates(await call_body(current_vars), tuple(accumulator_names), current)
+        for name, value, collector in zip(accumulator_names, updates, collectors):
+            if collector is None:
+                env[name] = value
+            elif value is _SKIP:
+                continue
+            elif collector.pairs:
+                getattr(env[name], collector.method)(*value)
+            else:
+                getattr(env[name], collector.method)(value)
+
+    env = final_env(accumulator_names, tuple(env[name] for name in accumulator_names), collectors)
+    if result:
+        return call_with(result, env)
+    else:
+        return env
+
+# Example usage
+if __name__ == "__main__":
+    import asyncio
+
+    async def readings():
+        for value in [3, 1, 4, 1, 5]:
+            yield value
+
+    async def body(total, peak, x):
+        return (total + x, max(peak, x))
+
+    summary = asyncio.run(async_for_fold(
+        accumulators=[("total", 0), ("peak", 0)],
+        iterables=[("x", readings())],
+        body=body,
+        result=lambda total, peak: (total, peak)
+    ))
+    print(f"Total and peak: {summary}")  # Output: Total and peak: (14, 5)
@@ -0,0 +1,61 @@
+from comps.async_engine import async_zip, bind, map_tasks
+from comps.engine import always_true
+from typing import Iterable, Callable, Any, AsyncGenerator, Tuple, List
+
+def async_for_generator(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    *,
+    when: Callable[..., bool] = always_true,
+    concurrency: int = 1,
+    ordered: bool = True
+) -> AsyncGenerator[Any, None]:
+    """
+    Returns an async generator that yields results over async or plain iterables.
+    `body` and `when` may be coroutine functions; with `concurrency` above one, up to that
+    many elements are evaluated at once as tasks, and `ordered=False` yields results as they complete.
+    """
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+    call_body = bind(body, iterable_names)
+    call_when = None if when is always_true else bind(when, iterable_names)
+
+    async def evaluate(values):
+        env = dict(zip(iterable_names, values))
+        if call_when is not None and not await call_when(env):
+            return (False, None)
+        return (True, await call_body(env))
+
+    async def generator():
+        if concurrency == 1:
+            async for values in async_zip(iterable_values):
+                hit, value = await evaluate(values)
+                if hit:
+                    yield value
+            return
+        results = map_tasks(async_zip(iterable_values), evaluate, concurrency, ordered=ordered)
+        try:
+            async for hit, value in results:
+                if hit:
+                    yield value
+        finally:
+            await results.aclose()
+
+    return generator()
+
+# Example usage
+if __name__ == "__main__":
+    import asyncio
+
+    async def fetch(n):
+        await asyncio.sleep(0.01)
+        return n * 10
+
+    async def main():
+        return [value async for value in async_for_generator(
+            iterables=[("n", range(5))],
+            body=fetch,
+            concurrency=3
+        )]
+
+    print(f"Fetched: {asyncio.run(main())}")  # Output: Fetched: [0, 10, 20, 30, 40]
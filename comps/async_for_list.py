@@ -0,0 +1,38 @@
+from comps.async_for_generator import async_for_generator
+from comps.engine import always_true
+from typing import Iterable, Callable, Any, List, Tuple
+
+async def async_for_list(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    *,
+    when: Callable[..., bool] = always_true,
+    concurrency: int = 1
+) -> List[Any]:
+    """
+    Collects results into a list, in input order, over async or plain iterables.
+    """
+    return [
+        value async for value in async_for_generator(
+            iterables, body, when=when, concurrency=concurrency
+        )
+    ]
+
+# Example usage
+if __name__ == "__main__":
+    import asyncio
+
+    async def numbers():
+        for n in range(1, 6):
+            yield n
+
+    async def square(n):
+        await asyncio.sleep(0.01)
+        return n * n
+
+    squares = asyncio.run(async_for_list(
+        iterables=[("n", numbers())],
+        body=square,
+        concurrency=2
+    ))
+    print(f"Squares: {squares}")  # Output: Squares: [1, 4, 9, 16, 25]
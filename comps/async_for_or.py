@@ -0,0 +1,49 @@
+from comps.async_engine import async_zip, bind, map_tasks
+from comps.engine import always_true
+from typing import Iterable, Callable, Any, List, Tuple
+
+async def async_for_or(
+    iterables: List[Tuple[str, Iterable]],
+    predicate: Callable[..., bool],
+    *,
+    when: Callable[..., bool] = always_true,
+    concurrency: int = 1
+) -> bool:
+    """
+    Returns True if the predicate is True for any item, False otherwise.
+    Up to `concurrency` checks run at once and the rest are cancelled on the first hit.
+    """
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+    call_predicate = bind(predicate, iterable_names)
+    call_when = None if when is always_true else bind(when, iterable_names)
+
+    async def check(values):
+        env = dict(zip(iterable_names, values))
+        if call_when is not None and not await call_when(env):
+            return False
+        return bool(await call_predicate(env))
+
+    checks = map_tasks(async_zip(iterable_values), check, concurrency, ordered=False)
+    try:
+        async for hit in checks:
+            if hit:
+                return True
+    finally:
+        await checks.aclose()
+    return False
+
+# Example usage
+if __name__ == "__main__":
+    import asyncio
+
+    async def is_even(n):
+        await asyncio.sleep(0.01)
+        return n % 2 == 0
+
+    any_even = asyncio.run(async_for_or(
+        iterables=[("n", [1, 3, 4, 7])],
+        predicate=is_even,
+        concurrency=2
+    ))
+    print(f"Any number is even: {any_even}")  # Output: Any number is even: True
@@ -0,0 +1,92 @@
+from comps.engine import always_true, apply_updates, call_spec, compile_bindings, invoke
+from typing import Callable, Any, Iterable, Iterator, List, Tuple, Dict, Sequence
+import itertools
+
+def batches(
+    iterable_names: List[str],
+    sources: Sequence[Iterable],
+    batch_size: int,
+    when: Callable[..., bool] = always_true,
+    *,
+    nested: bool = False,
+    env: Dict[str, Any] = None
+) -> Iterator[Dict[str, list]]:
+    """
+    Yields the bindings in chunks of `batch_size` as {name: list of values}.
+    `when` is called once per chunk with those lists (plus `env`, e.g. accumulators)
+    and returns one truth value per element; rejected elements are dropped.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer.")
+    env = env if env is not None else {}
+    when_spec = None if when is always_true else call_spec(when, list(env) + list(iterable_names))
+    rows = compile_bindings(iterable_names, nested=nested)(sources)
+    for chunk in iter(lambda: list(itertools.islice(rows, batch_size)), []):
+        columns = {name: list(values) for name, values in zip(iterable_names, zip(*chunk))}
+        if when_spec is not None:
+            mask = list(invoke(when, when_spec, {**env, **columns}))
+            if len(mask) != len(chunk):
+                raise ValueError("Batched when function must return one value per element.")
+            if not any(mask):
+                continue
+            if not all(mask):
+                columns = {
+                    name: list(itertools.compress(values, mask))
+                    for name, values in columns.items()
+                }
+        yield columns
+
+def batched_map(
+    iterable_names: List[str],
+    sources: Sequence[Iterable],
+    body: Callable[..., Sequence[Any]],
+    when: Callable[..., bool],
+    batch_size: int,
+    *,
+    nested: bool = False
+) -> Iterator[Any]:
+    """
+    Calls `body` once per chunk with lists of the bound variables and yields the
+    results it returns, one per selected element.
+    """
+    body_spec = call_spec(body, iterable_names)
+    for columns in batches(iterable_names, sources, batch_size, when, nested=nested):
+        results = invoke(body, body_spec, columns)
+        if not hasattr(results, "__len__"):
+            results = list(results)
+        if len(results) != len(next(iter(columns.values()), ())):
+            raise ValueError("Batched body function must return one result per element.")
+        yield from results
+
+def batched_fold(
+    iterable_names: List[str],
+    accumulator_names: List[str],
+    body: Callable[..., Tuple[Any, ...]],
+    when: Callable[..., bool],
+    batch_size: int,
+    sources: Sequence[Iterable],
+    initial: Sequence[Any],
+    collectors: Sequence[Any],
+    *,
+    nested: bool = False
+) -> Tuple[Any, ...]:
+    """
+    Fold step per chunk: `body` sees the accumulators and lists of the bound variables,
+    and returns the new accumulators. For a collector accumulator it returns the items
+    to add for the whole chunk.
+    """
+    names = tuple(accumulator_names)
+    env = dict(zip(names, initial))
+    body_spec = call_spec(body, list(names) + list(iterable_names))
+    skip = object()
+    for columns in batches(iterable_names, sources, batch_size, when, nested=nested, env=env):
+        current = tuple(skip if collector else env[name] for name, collector in zip(names, collectors))
+        updates = apply_updates(invoke(body, body_spec, {**env, **columns}), names, current)
+        for name, value, collector in zip(names, updates, collectors):
+            if collector is None:
+                env[name] = value
+            elif value is not skip:
+                add = getattr(env[name], collector.method)
+                for item in value:
+                    add(*item) if collector.pairs else add(item)
+    return tuple(env[name] for name in names)
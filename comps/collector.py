@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from typing import Callable, Any, List, Tuple, Dict
+from array import array
+from functools import partial
+
+@dataclass(frozen=True)
+class Collector:
+    """
+    Accumulator kind that is updated in place instead of being rebound.
+    The body returns the item to add for this accumulator, and the loop hands it to
+    `method` of the container built by `factory`. `freeze` converts the container
+    into the final value once the loop is done.
+    """
+    factory: Callable[[], Any]
+    method: str
+    freeze: Callable[[Any], Any] = None
+    pairs: bool = False  # items are (key, value) pairs passed as two arguments
+    hidden: bool = False  # left out of the callables' scope: only the loop adds to it
+
+    def __post_init__(self):
+        if not self.method.isidentifier():
+            raise ValueError(f"Invalid collector method: {self.method}")
+
+    def finish(self, container: Any) -> Any:
+        return self.freeze(container) if self.freeze else container
+
+def collect_list(*, hidden: bool = False) -> Collector:
+    return Collector(list, "append", hidden=hidden)
+
+def collect_tuple(*, hidden: bool = False) -> Collector:
+    return Collector(list, "append", tuple, hidden=hidden)
+
+def collect_set(*, hidden: bool = False) -> Collector:
+    return Collector(set, "add", hidden=hidden)
+
+def collect_array(typecode: str = "d", *, hidden: bool = False) -> Collector:
+    # Packed numeric buffer (see for_vector)
+    return Collector(partial(array, typecode), "append", hidden=hidden)
+
+def collect_dict(*, hidden: bool = False) -> Collector:
+    return Collector(dict, "__setitem__", pairs=True, hidden=hidden)
+
+def initial_values(accumulators: List[Tuple[str, Any]]) -> Tuple[List[Any], List[Collector]]:
+    """
+    Builds fresh containers for collector accumulators.
+    Returns the initial values and, per accumulator, its Collector or None.
+    """
+    collectors = [initial if isinstance(initial, Collector) else None for _, initial in accumulators]
+    values = [
+        collector.factory() if collector else initial
+        for (_, initial), collector in zip(accumulators, collectors)
+    ]
+    return values, collectors
+
+def final_env(names: List[str], values: Tuple[Any, ...], collectors: List[Collector]) -> Dict[str, Any]:
+    """
+    Freezes collector accumulators and pairs every final value with its name.
+    """
+    return {
+        name: collector.finish(value) if collector else value
+        for name, value, collector in zip(names, values, collectors)
+    }
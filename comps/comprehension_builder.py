@@ -1,3 +1,5 @@
+from comps.comprehension_plan import ComprehensionPlan
+from comps.engine import always_true
 from comps.operations import AddAccumulator, AddIterable, SetFilter, SetResult, SetBody
 from typing import Callable, Any, Iterable
 from dataclasses import dataclass
@@ -13,7 +15,7 @@ class ComprehensionBuilder:
     def __post_init__(self):
         self.accumulators = []
         self.iterables = []
-        self.filter_function = lambda **kwargs: True  # Default filter: always True
+        self.filter_function = always_true  # Default filter: always True
         self.result_name = None
         self.body_functions = []
 
@@ -33,49 +35,19 @@ class ComprehensionBuilder:
                 raise ValueError(f"Unsupported operation: {other}")
         return self
 
-    def run(self):
+    def compile(self) -> ComprehensionPlan:
+        """
+        Freezes the current configuration into a reusable ComprehensionPlan.
+        """
         if not self.body_functions:
             raise ValueError("Body function must be set before running the comprehension.")
+        return ComprehensionPlan(
+            accumulators=tuple(self.accumulators),
+            iterables=tuple(self.iterables),
+            body_functions=tuple(self.body_functions),
+            filter_function=self.filter_function,
+            result_name=self.result_name
+        )
 
-        if self.result_name is None:
-            # Default result: return all accumulator values as a dictionary
-            def default_result(**kwargs):
-                return {name: kwargs[name] for name, _ in self.accumulators}
-        else:
-            # Custom result: return the specified accumulator
-            def default_result(**kwargs):
-                return kwargs[self.result_name]
-
-        # Initialize the environment with accumulators
-        env = {name: value for name, value in self.accumulators}
-
-        # Prepare iterators for the iterables
-        iterators = [iterable for _, iterable in self.iterables]
-        iterable_names = [name for name, _ in self.iterables]
-        accumulator_names = [name for name, _ in self.accumulators]
-
-        # Iterate over the zipped iterables
-        for values in zip(*iterators):
-            # Current variables include accumulators and iterables
-            current_vars = {**env, **dict(zip(iterable_names, values))}
-
-            # Apply the filter function
-            if not self.filter_function(**current_vars):
-                continue  # Skip this iteration if filter condition is not met
-
-            # Apply each body function and collect updates
-            updates = []
-            for body_fn in self.body_functions:
-                updated_value = body_fn(**current_vars)
-                updates.append(updated_value)
-
-            # Update the accumulators in order
-            for i, value in enumerate(updates):
-                acc_name = accumulator_names[i]
-                env[acc_name] = value
-
-        # Prepare final variables for the result function
-        final_vars = {**env, **{name: None for name in iterable_names}}
-
-        # Return the result using the result function
-        return default_result(**final_vars)
+    def run(self):
+        return self.compile()()
@@ -0,0 +1,55 @@
+from comps.collector import initial_values, final_env
+from comps.engine import compile_fold
+from typing import Callable, Any, Iterable, Tuple
+from dataclasses import dataclass, field
+
+@dataclass(frozen=True)
+class ComprehensionPlan:
+    """
+    Immutable, picklable result of ComprehensionBuilder.compile().
+    All setup happens once; each call runs the cached specialized loop, optionally on
+    new data: plan(n=new_numbers). Iterables not passed keep the ones bound in the builder.
+    The compiled loop is not pickled; it is rebuilt when the plan is unpickled.
+    """
+    accumulators: Tuple[Tuple[str, Any], ...]
+    iterables: Tuple[Tuple[str, Iterable], ...]
+    body_functions: Tuple[Callable[..., Any], ...]
+    filter_function: Callable[..., bool]
+    result_name: str = None
+    _loop: Callable[..., Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_loop", self._compile())
+
+    def _compile(self) -> Callable[..., Any]:
+        _, collectors = initial_values(list(self.accumulators))
+        return compile_fold(
+            [name for name, _ in self.iterables],
+            [name for name, _ in self.accumulators],
+            list(self.body_functions),
+            self.filter_function,
+            collectors=collectors
+        )
+
+    def __call__(self, **iterables: Iterable) -> Any:
+        unknown = set(iterables) - {name for name, _ in self.iterables}
+        if unknown:
+            raise ValueError(f"Unknown iterable name: {', '.join(sorted(unknown))}")
+        sources = [iterables.get(name, default) for name, default in self.iterables]
+        initial, collectors = initial_values(list(self.accumulators))
+        env = final_env([name for name, _ in self.accumulators], self._loop(sources, initial), collectors)
+
+        if self.result_name is None:
+            # Default result: return all accumulator values as a dictionary
+            return env
+        # Custom result: return the specified accumulator
+        return env[self.result_name]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state["_loop"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        object.__setattr__(self, "_loop", self._compile())
@@ -0,0 +1,750 @@
+import inspect
+import types
+from comps.instrumentation import LoopStats, timed_body, timed_when, timed_run, timed_generator
+from comps.memo import Memo
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Callable, Any, Iterable, List, Sequence, Tuple, Dict
+
+
+def always_true(**kwargs) -> bool:
+    """
+    Default `when` clause. Compiled loops recognise it and skip the filter entirely.
+    """
+    return True
+
+
+@dataclass(frozen=True)
+class CallSpec:
+    """
+    How a compiled loop passes the bound names to a callable.
+    `all_names` is the fallback for **kwargs callables: every name is passed by keyword.
+    """
+    positional: Tuple[str, ...] = ()
+    keywords: Tuple[str, ...] = ()
+    all_names: bool = False
+
+
+# CallSpecs by (code object, defaults, bound method, names); see _spec_key
+_SPECS: Dict[Tuple[Any, ...], CallSpec] = {}
+_SPECS_SIZE = 4096
+
+
+def _spec_key(function: Callable[..., Any], names: Iterable[str]) -> Any:
+    """
+    Cache key for the CallSpec of a plain (or wrapped, or bound) Python function: every
+    lambda created by the same expression shares its code object, so repeated calls with
+    fresh lambdas inspect the signature only once. None for anything else.
+    """
+    bound = type(function) is types.MethodType
+    target = function.__func__ if bound else function
+    if hasattr(target, "__wrapped__"):
+        target = inspect.unwrap(target, stop=lambda f: hasattr(f, "__signature__"))
+    if type(target) is not types.FunctionType or hasattr(target, "__signature__"):
+        return None
+    defaults = target.__defaults__
+    keyword_defaults = target.__kwdefaults__
+    return (
+        target.__code__, len(defaults) if defaults else 0,
+        tuple(keyword_defaults) if keyword_defaults else (), bound, frozenset(names)
+    )
+
+
+def call_spec(function: Callable[..., Any], names: Iterable[str]) -> CallSpec:
+    """
+    Decides which of `names` `function` takes. Signatures of Python functions are
+    inspected once per code object and set of names.
+    """
+    names = tuple(names)
+    key = _spec_key(function, names)
+    spec = _SPECS.get(key) if key is not None else None
+    if spec is None:
+        spec = _inspect_spec(function, names)
+        if key is not None:
+            if len(_SPECS) >= _SPECS_SIZE:
+                _SPECS.clear()
+            _SPECS[key] = spec
+    return spec
+
+
+def _inspect_spec(function: Callable[..., Any], names: Iterable[str]) -> CallSpec:
+    try:
+        signature = inspect.signature(function)
+    except (TypeError, ValueError):
+        return CallSpec(all_names=True)
+
+    available = set(names)
+    positional, keywords = [], []
+    in_order = True
+    for param in signature.parameters.values():
+        if param.kind is param.VAR_KEYWORD:
+            return CallSpec(all_names=True)
+        if param.kind is param.VAR_POSITIONAL:
+            continue
+        if param.name not in available:
+            if param.default is param.empty:
+                # Let the call fail the same way the keyword path always did
+                return CallSpec(all_names=True)
+            in_order = False
+            continue
+        if param.kind is param.KEYWORD_ONLY:
+            keywords.append(param.name)
+        elif in_order:
+            positional.append(param.name)
+        elif param.kind is param.POSITIONAL_OR_KEYWORD:
+            keywords.append(param.name)
+        else:
+            return CallSpec(all_names=True)
+    return CallSpec(tuple(positional), tuple(keywords))
+
+
+def invoke(function: Callable[..., Any], spec: CallSpec, env: Dict[str, Any]) -> Any:
+    """
+    Calls `function` with the names from `env` selected by a precomputed CallSpec.
+    """
+    if spec.all_names:
+        return function(**env)
+    return function(*[env[name] for name in spec.positional], **{name: env[name] for name in spec.keywords})
+
+
+def call_with(function: Callable[..., Any], env: Dict[str, Any]) -> Any:
+    """
+    Calls `function` once with the names from `env` it actually takes.
+    """
+    return invoke(function, call_spec(function, env), env)
+
+
+def render_args(spec: CallSpec, scope: Dict[str, str]) -> str:
+    """
+    Renders the argument list for a call, mapping bound names to loop locals.
+    """
+    if spec.all_names:
+        items = ", ".join(f"{name!r}: {local}" for name, local in scope.items())
+        return f"**{{{items}}}"
+    args = [scope[name] for name in spec.positional]
+    args += [f"{name}={scope[name]}" for name in spec.keywords]
+    return ", ".join(args)
+
+
+def render_call(target: str, spec: CallSpec, scope: Dict[str, str]) -> str:
+    """
+    Renders the source of a call to `target`, mapping bound names to loop locals.
+    """
+    return f"{target}({render_args(spec, scope)})"
+
+
+def apply_updates(updates: Any, names: Tuple[str, ...], current: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Slow path for body results that are not a tuple of the right length.
+    A dict may update any subset of the accumulators by name.
+    """
+    if isinstance(updates, dict):
+        invalid = [name for name in updates if name not in names]
+        if invalid:
+            raise ValueError(f"Invalid accumulator name in updates: {', '.join(map(str, invalid))}")
+        return tuple(updates.get(name, value) for name, value in zip(names, current))
+    if not isinstance(updates, tuple):
+        raise TypeError("Body function must return a tuple of accumulator values.")
+    if len(updates) != len(names):
+        raise ValueError("Body function must return a value for each accumulator.")
+    return updates
+
+
+_GLOBALS = {
+    "zip": zip,
+    "_partial": partial,
+    "_updates": apply_updates,
+    "_skip": object(),
+}
+
+
+@lru_cache(maxsize=256)
+def _build(source: str, name: str) -> Callable[..., Any]:
+    namespace = {}
+    exec(source, dict(_GLOBALS), namespace)
+    return namespace[name]
+
+
+def is_dependent(source: Any) -> bool:
+    """
+    A nested clause given as a function of the outer variables, e.g. `("j", lambda i: range(i))`.
+    """
+    return callable(source) and not hasattr(source, "__iter__")
+
+
+class Replay:
+    """
+    Re-iterable view of a one-shot iterator used as an inner nested clause.
+    Items are pulled lazily on the first pass and replayed from a cache afterwards.
+    """
+    def __init__(self, iterator: Iterable):
+        self.iterator = iter(iterator)
+        self.items = []
+        self.exhausted = False
+
+    def __iter__(self):
+        if self.exhausted:
+            return iter(self.items)
+        return self._pull()
+
+    def _pull(self):
+        items = self.items
+        index = 0
+        while True:
+            if index < len(items):
+                yield items[index]
+            elif self.exhausted:
+                return
+            else:
+                try:
+                    item = next(self.iterator)
+                except StopIteration:
+                    self.exhausted = True
+                    return
+                items.append(item)
+                yield item
+            index += 1
+
+
+def clause_layout(iterable_names: Sequence[str], sources: Sequence[Any]) -> Tuple[Any, ...]:
+    """
+    Per nested clause: None for an iterable, or the CallSpec of a dependent clause.
+    """
+    return tuple(
+        call_spec(source, iterable_names[:i]) if is_dependent(source) else None
+        for i, source in enumerate(sources)
+    )
+
+
+def prepare_clauses(sources: Sequence[Any]) -> list:
+    """
+    Wraps one-shot iterators used as inner clauses so every outer binding can re-iterate them.
+    The outermost clause is iterated exactly once and is left untouched.
+    """
+    return [
+        source if i == 0 or is_dependent(source) or iter(source) is not source else Replay(source)
+        for i, source in enumerate(sources)
+    ]
+
+
+def _loop_lines(iterable_names: Sequence[str], layout: Tuple[Any, ...], guards: Sequence[Tuple[int, str]] = ()) -> List[str]:
+    """
+    Loop header lines, indented for a function body. `layout` is None for zip iteration,
+    otherwise one entry per nested clause (see clause_layout). Each guard `(level, condition)`
+    skips the rest of the loop at that clause when its condition is false.
+    """
+    count = len(iterable_names)
+    if layout is None:
+        targets = ", ".join(f"_v{i}" for i in range(count)) or "_"
+        if count == 1:
+            headers = ["for _v0 in _s0:"]
+        else:
+            headers = [f"for {targets} in zip({', '.join(f'_s{i}' for i in range(count))}):"]
+    elif not count:
+        # The product of no clauses has exactly one (empty) binding
+        headers = ["for _ in ((),):"]
+    else:
+        headers = []
+        for i, spec in enumerate(layout):
+            outer = {name: f"_v{j}" for j, name in enumerate(iterable_names[:i])}
+            source = f"_s{i}" if spec is None else render_call(f"_s{i}", spec, outer)
+            headers.append(f"for _v{i} in {source}:")
+
+    lines = []
+    for level, header in enumerate(headers):
+        lines.append("    " * (level + 1) + header)
+        pad = "    " * (level + 2)
+        for guard_level, condition in guards:
+            if guard_level == level:
+                lines += [f"{pad}if not {condition}:", f"{pad}    continue"]
+    return lines
+
+
+def _guards(specs: Sequence[CallSpec], iterable_names: Tuple[str, ...], scope: Dict[str, str], nested: bool) -> List[Tuple[int, str]]:
+    """
+    Places every `when` predicate (given by its CallSpec) at the outermost clause where
+    all the names it takes are bound, so nested loops prune whole sub-products.
+    Predicates that take accumulators or **kwargs stay at the innermost clause, where
+    they always were.
+    """
+    innermost = max(len(iterable_names) - 1, 0) if nested else 0
+    bound_at = {name: i for i, name in enumerate(iterable_names)}
+    guards = []
+    for i, spec in enumerate(specs):
+        level = innermost
+        needed = spec.positional + spec.keywords
+        if nested and not spec.all_names and all(name in bound_at for name in needed):
+            level = max((bound_at[name] for name in needed), default=0)
+        guards.append((level, render_call(f"_when{i}", spec, scope)))
+    return guards
+
+
+def _whens(when: Any) -> Tuple[Callable[..., bool], ...]:
+    # `when` may be one predicate or a list of predicates that must all hold
+    whens = tuple(when) if isinstance(when, (list, tuple)) else (when,)
+    return tuple(predicate for predicate in whens if predicate is not always_true)
+
+
+def _depth(iterable_names: Sequence[str], layout: Tuple[Any, ...]) -> int:
+    # Number of loops the header opens
+    return 1 if layout is None else max(len(iterable_names), 1)
+
+
+def _indent(lines: List[str], depth: int) -> List[str]:
+    pad = "    " * depth
+    return [pad + line for line in lines]
+
+
+# Built loop functions by (shape key, clause layout); see _specialize
+_LOOPS: Dict[Tuple[Any, ...], Callable[..., Any]] = {}
+_LOOPS_SIZE = 1024
+
+
+def _specialize(
+    iterable_names: Tuple[str, ...],
+    nested: bool,
+    key: Tuple[Any, ...],
+    generate: Callable[[Any], str],
+    name: str,
+    args: Tuple[Any, ...] = ()
+) -> Callable[..., Any]:
+    """
+    Flat loops are built right away. Nested loops depend on which clauses are
+    dependent, so they are built on first use for each clause layout.
+    `generate(layout)` returns the source of function `name`, and `key` everything else
+    that source depends on (names, CallSpecs, kinds), so the loop is generated once per
+    shape and later compiles with other callables of the same shape only bind `args`.
+    """
+    def build(layout):
+        function = _LOOPS.get((key, layout))
+        if function is None:
+            function = _build(generate(layout), name)
+            if len(_LOOPS) >= _LOOPS_SIZE:
+                _LOOPS.clear()
+            _LOOPS[key, layout] = function
+        return partial(function, *args) if args else function
+
+    if not nested:
+        return build(None)
+    loops = {}
+
+    def run(sources, *more):
+        layout = clause_layout(iterable_names, sources)
+        loop = loops.get(layout)
+        if loop is None:
+            loop = loops[layout] = build(layout)
+        return loop(prepare_clauses(sources), *more)
+    return run
+
+
+def _unpack(names: Sequence[str], prefix: str, source: str) -> str:
+    if not names:
+        return ""
+    return f"{', '.join(f'{prefix}{i}' for i in range(len(names)))}, = {source}"
+
+
+def _store(index: int, collector: Any, value: str) -> str:
+    # Plain accumulators are rebound, collectors are updated in place
+    if collector is None:
+        return f"_a{index} = {value}"
+    return f"_c{index}({'*' if collector[1] else ''}{value})"
+
+
+def compile_fold(
+    iterable_names: Sequence[str],
+    accumulator_names: Sequence[str],
+    body: Any,
+    when: Callable[..., bool] = always_true,
+    *,
+    nested: bool = False,
+    collectors: Sequence[Any] = (),
+    stats: LoopStats = None,
+    memo: Memo = None,
+    break_when: Callable[..., bool] = None,
+    final_when: Callable[..., bool] = None
+) -> Callable[[Sequence[Iterable], Sequence[Any]], Tuple[Any, ...]]:
+    """
+    Generates a specialized fold loop and returns `run(sources, initial) -> final accumulators`.
+    `body` is either one callable returning a tuple of accumulator values, or a list of
+    callables returning one accumulator value each (as ComprehensionBuilder's SetBody).
+    `collectors` holds a Collector or None per accumulator; for a Collector the body
+    returns the item to add to its container rather than a new value.
+    Nested loops are streamed clause by clause (see clause_layout and prepare_clauses).
+    With `stats`, the callables and sources are wrapped to fill it in; without it the
+    generated loop carries no instrumentation at all. With `memo`, body and when results
+    are cached by their arguments.
+    `break_when` and `final_when` are checked, with the accumulators before the step, for
+    every binding that passes `when`: the first stops the loop before the body runs, the
+    second right after it. Either way no further item is pulled from the sources.
+    """
+    iterable_names = tuple(iterable_names)
+    accumulator_names = tuple(accumulator_names)
+    # Collectors only shape the source through their method and pairs flag
+    shapes = tuple(None if c is None else (c.method, c.pairs) for c in collectors) or (None,) * len(accumulator_names)
+    # Hidden collectors (for_list and friends) are filled by the loop but never passed to callables
+    hidden = {name for name, c in zip(accumulator_names, collectors) if c is not None and c.hidden}
+    scope = {name: f"_a{i}" for i, name in enumerate(accumulator_names) if name not in hidden}
+    scope.update({name: f"_v{i}" for i, name in enumerate(iterable_names)})
+    names = tuple(scope)
+
+    bodies = tuple(body) if isinstance(body, (list, tuple)) else (body,)
+    per_accumulator = isinstance(body, (list, tuple))
+    if per_accumulator and len(bodies) > len(accumulator_names):
+        raise ValueError("There are more body functions than accumulators.")
+
+    whens = _whens(when)
+    if memo is not None:
+        bodies = tuple(memo.wrap(fn) for fn in bodies)
+        whens = tuple(memo.wrap(predicate) for predicate in whens)
+    if stats is not None:
+        bodies = tuple(timed_body(stats, fn) for fn in bodies)
+        whens = tuple(timed_when(stats, predicate) for predicate in whens)
+    stops = tuple(stop for stop in (break_when, final_when) if stop is not None)
+    body_specs = tuple(call_spec(fn, names) for fn in bodies)
+    when_specs = tuple(call_spec(predicate, names) for predicate in whens)
+    break_spec = call_spec(break_when, names) if break_when is not None else None
+    final_spec = call_spec(final_when, names) if final_when is not None else None
+    key = ("fold", iterable_names, accumulator_names, names, per_accumulator, shapes, body_specs, when_specs, break_spec, final_spec, nested)
+
+    def generate(layout):
+        step = []
+        if per_accumulator:
+            for i, spec in enumerate(body_specs):
+                step.append(f"_b{i} = {render_call(f'_body{i}', spec, scope)}")
+            for i in range(len(body_specs)):
+                step.append(_store(i, shapes[i], f"_b{i}"))
+        else:
+            count = len(accumulator_names)
+            targets = ", ".join(f"_a{i}" if c is None else f"_x{i}" for i, c in enumerate(shapes))
+            current = ", ".join(f"_a{i}" if c is None else "_skip" for i, c in enumerate(shapes))
+            updates = f"_updates(_r, {accumulator_names!r}, ({current}{',' if current else ''}))"
+            step += [
+                f"_r = {render_call('_body0', body_specs[0], scope)}",
+                f"if _r.__class__ is tuple and len(_r) == {count}:",
+                f"    {targets + ', = _r' if count else 'pass'}",
+            ]
+            step += [f"    {_store(i, c, f'_x{i}')}" for i, c in enumerate(shapes) if c is not None]
+            step += [
+                "else:",
+                f"    {targets + ', = ' if count else ''}{updates}",
+            ]
+            for i, c in enumerate(shapes):
+                if c is not None:
+                    step += [f"    if _x{i} is not _skip:", f"        {_store(i, c, f'_x{i}')}"]
+
+        accumulators = ", ".join(f"_a{i}" for i in range(len(accumulator_names)))
+        finish = f"return ({accumulators}{',' if accumulators else ''})"
+
+        # Early termination returns the accumulators from inside the (possibly nested) loop
+        if final_spec is not None:
+            step = [f"_final = {render_call(f'_stop{len(stops) - 1}', final_spec, scope)}"] + step
+            step += ["if _final:", f"    {finish}"]
+        if break_spec is not None:
+            step = [f"if {render_call('_stop0', break_spec, scope)}:", f"    {finish}"] + step
+
+        lines = [
+            "def _fold(_bodies, _whens, _stops, _sources, _init):",
+            f"    {_unpack(bodies, '_body', '_bodies')}",
+            f"    {_unpack(whens, '_when', '_whens')}",
+            f"    {_unpack(stops, '_stop', '_stops')}",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+            f"    {_unpack(accumulator_names, '_a', '_init')}",
+        ]
+        lines += [f"    _c{i} = _a{i}.{c[0]}" for i, c in enumerate(shapes) if c is not None]
+        lines += _loop_lines(iterable_names, layout, _guards(when_specs, iterable_names, scope, nested))
+        lines += _indent(step, _depth(iterable_names, layout) + 1)
+        lines.append(f"    {finish}")
+        return "\n".join(lines) + "\n"
+
+    run = _specialize(iterable_names, nested, key, generate, "_fold", (bodies, whens, stops))
+    return run if stats is None else timed_run(stats, run)
+
+
+def compile_map(
+    iterable_names: Sequence[str],
+    body: Callable[..., Any],
+    when: Callable[..., bool] = always_true,
+    *,
+    nested: bool = False,
+    deferred: bool = False,
+    stats: LoopStats = None,
+    memo: Memo = None
+) -> Callable[[Sequence[Iterable]], Iterable[Any]]:
+    """
+    Generates a specialized generator and returns `run(sources)`, which yields
+    `body` for every binding that satisfies `when`.
+    With `deferred`, it yields zero-argument partials of `body` instead of calling it.
+    `stats` and `memo` work as for compile_fold.
+    """
+    iterable_names = tuple(iterable_names)
+    scope = {name: f"_v{i}" for i, name in enumerate(iterable_names)}
+
+    whens = _whens(when)
+    if memo is not None:
+        body = memo.wrap(body)
+        whens = tuple(memo.wrap(predicate) for predicate in whens)
+    if stats is not None:
+        body = timed_body(stats, body)
+        whens = tuple(timed_when(stats, predicate) for predicate in whens)
+    spec = call_spec(body, iterable_names)
+    when_specs = tuple(call_spec(predicate, iterable_names) for predicate in whens)
+    key = ("map", iterable_names, spec, when_specs, deferred, nested)
+
+    def generate(layout):
+        if deferred:
+            args = render_args(spec, scope)
+            step = [f"yield _partial(_body{', ' if args else ''}{args})"]
+        else:
+            step = [f"yield {render_call('_body', spec, scope)}"]
+        lines = [
+            "def _map(_body, _whens, _sources):",
+            f"    {_unpack(whens, '_when', '_whens')}",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+        ]
+        lines += _loop_lines(iterable_names, layout, _guards(when_specs, iterable_names, scope, nested))
+        lines += _indent(step, _depth(iterable_names, layout) + 1)
+        return "\n".join(lines) + "\n"
+
+    run = _specialize(iterable_names, nested, key, generate, "_map", (body, whens))
+    return run if stats is None else timed_generator(stats, run)
+
+
+def compile_bindings(iterable_names: Sequence[str], *, nested: bool = False) -> Callable[[Sequence[Iterable]], Iterable[Tuple[Any, ...]]]:
+    """
+    Returns `run(sources)`, which yields the tuple of values of every binding.
+    """
+    iterable_names = tuple(iterable_names)
+    values = ", ".join(f"_v{i}" for i in range(len(iterable_names)))
+
+    def generate(layout):
+        lines = [
+            "def _bindings(_sources):",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+        ]
+        lines += _loop_lines(iterable_names, layout)
+        lines += _indent([f"yield ({values}{',' if values else ''})"], _depth(iterable_names, layout) + 1)
+        return "\n".join(lines) + "\n"
+
+    return _specialize(iterable_names, nested, ("bindings", iterable_names, nested), generate, "_bindings")
+
+
+# Fused collector kinds: in-place container method, or None for a rebound accumulator
+FUSED_METHODS = {
+    "sum": None, "product": None, "first": None, "last": None, "and": None, "or": None,
+    "list": "append", "tuple": "append", "set": "add", "dict": "__setitem__",
+}
+
+
+def compile_fused(
+    iterable_names: Sequence[str],
+    kinds: Sequence[str],
+    bodies: Sequence[Callable[..., Any]],
+    filters: Sequence[Callable[..., bool]],
+    when: Callable[..., bool] = always_true,
+    *,
+    nested: bool = False
+) -> Callable[[Sequence[Iterable], Sequence[Any]], Tuple[Any, ...]]:
+    """
+    Generates one loop that feeds every binding passing `when` to several collectors and
+    returns `run(sources, initial) -> final values`. `filters` holds an extra predicate
+    (or always_true) per collector. first/and/or collectors stop calling their body once
+    decided; when all collectors are of that kind the loop returns as soon as all are.
+    """
+    iterable_names = tuple(iterable_names)
+    kinds = tuple(kinds)
+    for kind in kinds:
+        if kind not in FUSED_METHODS:
+            raise ValueError(f"Unsupported collector kind: {kind}")
+    scope = {name: f"_v{i}" for i, name in enumerate(iterable_names)}
+    extra = tuple(predicate for predicate in filters if predicate is not always_true)
+    body_specs = tuple(call_spec(body, iterable_names) for body in bodies)
+    # Per collector: None, or the index and CallSpec of its own filter
+    filter_specs = tuple(
+        None if predicate is always_true else (extra.index(predicate), call_spec(predicate, iterable_names))
+        for predicate in filters
+    )
+    whens = _whens(when)
+    when_specs = tuple(call_spec(predicate, iterable_names) for predicate in whens)
+    key = ("fused", iterable_names, kinds, body_specs, filter_specs, when_specs, nested)
+
+    def generate(layout):
+        values = ", ".join(f"_a{i}" for i in range(len(kinds)))
+        finish = f"return ({values}{',' if values else ''})"
+        short = [i for i, kind in enumerate(kinds) if kind in ("first", "and", "or")]
+        step = []
+        for i, (kind, spec, own) in enumerate(zip(kinds, body_specs, filter_specs)):
+            call = render_call(f"_body{i}", spec, scope)
+            done = [f"_d{i} = True", "_live -= 1"]
+            lines = {
+                "sum": [f"_a{i} = _a{i} + {call}"],
+                "product": [f"_a{i} = _a{i} * {call}"],
+                "last": [f"_a{i} = {call}"],
+                "first": [f"_a{i} = {call}"] + done,
+                "and": [f"if not {call}:", f"    _a{i} = False"] + _indent(done, 1),
+                "or": [f"if {call}:", f"    _a{i} = True"] + _indent(done, 1),
+                "dict": [f"_c{i}(*{call})"],
+            }.get(kind, [f"_c{i}({call})"])
+            if own is not None:
+                lines = [f"if {render_call(f'_filter{own[0]}', own[1], scope)}:"] + _indent(lines, 1)
+            if i in short:
+                lines = [f"if not _d{i}:"] + _indent(lines, 1)
+            step += lines
+        if short and len(short) == len(kinds):
+            step += ["if not _live:", f"    {finish}"]
+
+        lines = [
+            "def _fused(_bodies, _whens, _filters, _sources, _init):",
+            f"    {_unpack(bodies, '_body', '_bodies')}",
+            f"    {_unpack(whens, '_when', '_whens')}",
+            f"    {_unpack(extra, '_filter', '_filters')}",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+            f"    {_unpack(kinds, '_a', '_init')}",
+            f"    _live = {len(short)}",
+        ]
+        lines += [f"    _d{i} = False" for i in short]
+        lines += [f"    _c{i} = _a{i}.{FUSED_METHODS[kind]}" for i, kind in enumerate(kinds) if FUSED_METHODS[kind]]
+        lines += _loop_lines(iterable_names, layout, _guards(when_specs, iterable_names, scope, nested))
+        lines += _indent(step, _depth(iterable_names, layout) + 1)
+        lines.append(f"    {finish}")
+        return "\n".join(lines) + "\n"
+
+    return _specialize(iterable_names, nested, key, generate, "_fused", (tuple(bodies), whens, extra))
+
+
+PIPELINE_STAGES = ("map", "filter", "flat_map", "take_while")
+PIPELINE_TERMINALS = ("yield", "collect", "sum", "reduce", "first", "last")
+
+
+def compile_pipeline(
+    iterable_names: Sequence[str],
+    stages: Sequence[Tuple[str, Callable[..., Any]]],
+    terminal: str = "yield",
+    *,
+    method: str = None,
+    nested: bool = False
+) -> Callable[..., Any]:
+    """
+    Fuses a chain of (kind, function) stages (map, filter, flat_map, take_while) and a
+    terminal into one loop. Functions of the stages before the first map or flat_map take
+    the bound names; later ones take the current value. Without a map, the value is the
+    bound value, or the tuple of them for several clauses.
+    "yield" gives `run(sources)`, a generator; every other terminal gives
+    `run(sources, initial[, reducer]) -> value`: "collect" calls `initial.<method>(value)`,
+    "sum" adds, "reduce" applies `reducer(accumulated, value)`, and "first"/"last" return
+    the first/last value or `initial`. take_while ends the whole chain.
+    """
+    iterable_names = tuple(iterable_names)
+    scope = {name: f"_v{i}" for i, name in enumerate(iterable_names)}
+    if terminal not in PIPELINE_TERMINALS:
+        raise ValueError(f"Unsupported pipeline terminal: {terminal}")
+    if terminal == "collect" and not (method or "").isidentifier():
+        raise ValueError(f"Invalid collector method: {method}")
+
+    # Per stage: its kind and, while values are still the bound names, its CallSpec
+    shape = []
+    bound = True
+    for kind, function in stages:
+        if kind not in PIPELINE_STAGES:
+            raise ValueError(f"Unsupported pipeline stage: {kind}")
+        shape.append((kind, call_spec(function, iterable_names) if bound else None))
+        if kind in ("map", "flat_map"):
+            bound = False
+    shape = tuple(shape)
+    key = ("pipeline", iterable_names, shape, terminal, method, nested)
+
+    def generate(layout):
+        stop = "return" if terminal == "yield" else "return _acc"
+        value = "_v0" if len(iterable_names) == 1 else f"({', '.join(scope.values())}{',' if scope else ''})"
+        step = []
+        depth = 0
+        for k, (kind, spec) in enumerate(shape):
+            call = render_call(f"_f{k}", spec, scope) if spec is not None else f"_f{k}({value})"
+            if kind == "map":
+                lines = [f"_x{k} = {call}"]
+            elif kind == "flat_map":
+                lines = [f"for _x{k} in {call}:"]
+            else:
+                lines = [f"if not {call}:", f"    {'continue' if kind == 'filter' else stop}"]
+            step += _indent(lines, depth)
+            if kind in ("map", "flat_map"):
+                value = f"_x{k}"
+            if kind == "flat_map":
+                depth += 1
+        step += _indent([{
+            "yield": f"yield {value}",
+            "collect": f"_add({value})",
+            "sum": f"_acc = _acc + {value}",
+            "reduce": f"_acc = _reduce(_acc, {value})",
+            "first": f"return {value}",
+            "last": f"_acc = {value}",
+        }[terminal]], depth)
+
+        lines = [
+            "def _pipeline(_functions, _sources, _acc=None, _reduce=None):",
+            f"    {_unpack(shape, '_f', '_functions')}",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+        ]
+        if terminal == "collect":
+            lines.append(f"    _add = _acc.{method}")
+        lines += _loop_lines(iterable_names, layout)
+        lines += _indent(step, _depth(iterable_names, layout) + 1)
+        if terminal != "yield":
+            lines.append("    return _acc")
+        return "\n".join(lines) + "\n"
+
+    functions = tuple(function for _, function in stages)
+    return _specialize(iterable_names, nested, key, generate, "_pipeline", (functions,))
+
+
+GROUP_KINDS = ("sum", "count", "min", "max", "list", "set", "fold")
+
+
+def compile_group(
+    iterable_names: Sequence[str],
+    key: Callable[..., Any],
+    value: Callable[..., Any],
+    kind: str,
+    when: Callable[..., bool] = always_true,
+    *,
+    nested: bool = False
+) -> Callable[..., Dict[Any, Any]]:
+    """
+    Generates a hash-aggregate loop and returns `run(sources, table, initial=None, step=None)`,
+    which updates `table` in place, {key: state}, and returns it. sum/count/min/max keep a
+    scalar per key, list/set a container, and "fold" applies `step(state, value)` starting
+    from `initial`. `value` is ignored for count.
+    """
+    if kind not in GROUP_KINDS:
+        raise ValueError(f"Unsupported aggregation: {kind}")
+    iterable_names = tuple(iterable_names)
+    scope = {name: f"_v{i}" for i, name in enumerate(iterable_names)}
+    key_spec = call_spec(key, iterable_names)
+    value_spec = None if kind == "count" else call_spec(value, iterable_names)
+    whens = _whens(when)
+    when_specs = tuple(call_spec(predicate, iterable_names) for predicate in whens)
+    shape = ("group", iterable_names, kind, key_spec, value_spec, when_specs, nested)
+
+    def generate(layout):
+        item = "None" if value_spec is None else render_call("_value", value_spec, scope)
+        step = [f"_k = {render_call('_key', key_spec, scope)}"]
+        step += {
+            "sum": [f"_t[_k] = _get(_k, 0) + {item}"],
+            "count": ["_t[_k] = _get(_k, 0) + 1"],
+            "min": [f"_x = {item}", "_o = _get(_k)", "if _o is None or _x < _o:", "    _t[_k] = _x"],
+            "max": [f"_x = {item}", "_o = _get(_k)", "if _o is None or _x > _o:", "    _t[_k] = _x"],
+            "list": [f"_x = {item}", "_o = _get(_k)", "if _o is None:", "    _t[_k] = [_x]", "else:", "    _o.append(_x)"],
+            "set": [f"_x = {item}", "_o = _get(_k)", "if _o is None:", "    _t[_k] = {_x}", "else:", "    _o.add(_x)"],
+            "fold": ["_o = _get(_k, _skip)", f"_t[_k] = _step(_initial if _o is _skip else _o, {item})"],
+        }[kind]
+        lines = [
+            "def _group(_key, _value, _whens, _sources, _t, _initial=None, _step=None):",
+            f"    {_unpack(whens, '_when', '_whens')}",
+            f"    {_unpack(iterable_names, '_s', '_sources')}",
+            "    _get = _t.get",
+        ]
+        lines += _loop_lines(iterable_names, layout, _guards(when_specs, iterable_names, scope, nested))
+        lines += _indent(step, _depth(iterable_names, layout) + 1)
+        lines.append("    return _t")
+        return "\n".join(lines) + "\n"
+
+    return _specialize(iterable_names, nested, shape, generate, "_group", (key, value, whens))
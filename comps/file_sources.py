@@ -0,0 +1,215 @@
+from typing import Any, Iterator, Tuple, Union
+import mmap
+import os
+import struct
+
+class MappedFile:
+    """
+    Read-only memory map of `path`. Items are read straight from the page cache, so a
+    fold over a large file runs in constant memory. Iterating maps the file, and the map
+    is closed again once the last running iteration ends, so a source passed straight to
+    a for_* function leaves nothing open. Used as a context manager, the map stays open
+    and shared by every pass until the block exits. Random access keeps it open until
+    `close()`. Views handed out stay valid while the map is open.
+    Pickling sends the path, so a parallel fold reopens the file in each worker.
+    """
+    def __init__(self, path: Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self._file = None
+        self._map = None
+        self._view = None
+        self._users = 0
+        self._entered = False
+
+    def buffer(self) -> memoryview:
+        if self._view is None:
+            self._file = open(self.path, "rb")
+            if os.fstat(self._file.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                self._view = memoryview(b"")
+            else:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._map)
+        return self._view
+
+    def _acquire(self) -> memoryview:
+        # One more running iteration over the map
+        self._users += 1
+        return self.buffer()
+
+    def _release(self) -> None:
+        self._users -= 1
+        if not self._users and not self._entered:
+            self.close()
+
+    def close(self) -> None:
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                pass
+            self._view = None
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                # Views of lines or records are still alive; the map closes with them
+                pass
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        self._entered = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self._entered = False
+        self.close()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.update(_file=None, _map=None, _view=None, _users=0, _entered=False)
+        return state
+
+class MappedLines(MappedFile):
+    """
+    Lines of a file as memoryviews into the map, or as str when `encoding` is given.
+    Line endings are stripped unless `keepends`.
+    """
+    def __init__(self, path: Union[str, os.PathLike], *, encoding: str = None, keepends: bool = False):
+        super().__init__(path)
+        self.encoding = encoding
+        self.keepends = keepends
+
+    def __iter__(self) -> Iterator[Any]:
+        view = self._acquire()
+        try:
+            data = self._map
+            encoding = self.encoding
+            keep = 1 if self.keepends else 0
+            size = view.nbytes
+            start = 0
+            while start < size:
+                newline = data.find(b"\n", start)
+                end = size if newline < 0 else newline
+                stop = end + keep if newline >= 0 else end
+                if not keep and end > start and data[end - 1] == 13:
+                    stop = end - 1
+                line = view[start:stop]
+                yield line if encoding is None else str(line, encoding)
+                start = end + 1
+        finally:
+            self._release()
+
+class MappedFields(MappedLines):
+    """
+    Delimited fields of every line as a tuple of bytes, or of str when `encoding` is given.
+    """
+    def __init__(self, path: Union[str, os.PathLike], delimiter: Union[bytes, str] = b",", *, encoding: str = None):
+        super().__init__(path)
+        self.delimiter = delimiter.encode() if isinstance(delimiter, str) else delimiter
+        self.field_encoding = encoding
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        delimiter = self.delimiter
+        encoding = self.field_encoding
+        for line in super().__iter__():
+            fields = bytes(line).split(delimiter)
+            yield tuple(fields) if encoding is None else tuple(str(field, encoding) for field in fields)
+
+class MappedRecords(MappedFile):
+    """
+    Fixed-width binary records unpacked with the struct `layout`, starting at byte `offset`.
+    Records have a length, random access and slicing, so sized-input fast paths apply;
+    `raw=True` yields each record as a memoryview instead of a tuple of fields.
+    """
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        layout: Union[str, struct.Struct],
+        *,
+        offset: int = 0,
+        raw: bool = False,
+        start: int = 0,
+        stop: int = None
+    ):
+        super().__init__(path)
+        self.layout = layout if isinstance(layout, str) else layout.format
+        self.struct = struct.Struct(self.layout)
+        self.offset = offset
+        self.raw = raw
+        total = max(os.path.getsize(self.path) - offset, 0) // self.struct.size
+        self.indices = range(total)[start:stop]
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self) -> Iterator[Any]:
+        size = self.struct.size
+        begin = self.offset + self.indices.start * size
+        records = self._acquire()[begin:begin + len(self.indices) * size]
+        try:
+            if self.raw:
+                for i in range(0, records.nbytes, size):
+                    yield records[i:i + size]
+            else:
+                yield from self.struct.iter_unpack(records)
+        finally:
+            records.release()
+            self._release()
+
+    def __reversed__(self) -> Iterator[Any]:
+        # Walks the records last first, mapping the file only while the walk runs
+        size = self.struct.size
+        begin = self.offset + self.indices.start * size
+        view = self._acquire()
+        try:
+            unpack = self.struct.unpack_from
+            for position in range(begin + (len(self.indices) - 1) * size, begin - 1, -size):
+                yield view[position:position + size] if self.raw else unpack(view, position)
+        finally:
+            self._release()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("Record slices must be contiguous.")
+            part = self.indices[index]
+            return MappedRecords(self.path, self.layout, offset=self.offset, raw=self.raw, start=part.start, stop=part.stop)
+        position = self.offset + self.indices[index] * self.struct.size
+        if self.raw:
+            return self.buffer()[position:position + self.struct.size]
+        return self.struct.unpack_from(self.buffer(), position)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        del state["struct"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.struct = struct.Struct(self.layout)
+
+def in_lines(path: Union[str, os.PathLike], *, encoding: str = None, keepends: bool = False) -> MappedLines:
+    return MappedLines(path, encoding=encoding, keepends=keepends)
+
+def in_fields(path: Union[str, os.PathLike], delimiter: Union[bytes, str] = b",", *, encoding: str = None) -> MappedFields:
+    return MappedFields(path, delimiter, encoding=encoding)
+
+def in_records(path: Union[str, os.PathLike], layout: Union[str, struct.Struct], *, offset: int = 0, raw: bool = False) -> MappedRecords:
+    return MappedRecords(path, layout, offset=offset, raw=raw)
+
+# Example usage
+if __name__ == "__main__":
+    import tempfile
+    from comps.for_sum import for_sum
+
+    with tempfile.NamedTemporaryFile(delete=False) as output:
+        output.write(struct.pack("<4d", 1.5, 2.5, 3.0, 4.0))
+
+    with in_records(output.name, "<d") as records:
+        total = for_sum(iterables=[("record", records)], body=lambda record: record[0])
+        print(f"{len(records)} records, total {total}")  # Output: 4 records, total 11.0
+    os.remove(output.name)
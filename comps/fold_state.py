@@ -0,0 +1,118 @@
+from comps.collector import initial_values, final_env
+from comps.engine import always_true, call_with, compile_fold
+from comps.instrumentation import LoopStats
+from comps.memo import Memo, as_memo
+from typing import Callable, Any, Iterable, List, Tuple, Dict, Union
+import copy
+
+class FoldState:
+    """
+    Push-based fold: the same accumulators, body and when as for_fold, but the items
+    arrive over time through send() or feed() instead of being pulled from iterables.
+    `variables` names the iteration variables each item binds; an item is a single
+    value for one variable, or a tuple with a value per variable.
+    result() hands out copies of list/set/dict collectors, so changing a result never
+    changes the fold; frozen collectors (tuples) are built once and reused until the
+    next send(), feed() or reset().
+    """
+    def __init__(
+        self,
+        accumulators: List[Tuple[str, Any]],
+        variables: List[str],
+        body: Callable[..., Tuple[Any, ...]],
+        *,
+        when: Callable[..., bool] = always_true,
+        result: Callable[..., Any] = None,
+        stats: LoopStats = None,
+        memo: Union[bool, int, Memo] = None
+    ):
+        self.accumulators = list(accumulators)
+        self.variables = list(variables)
+        self.result_function = result
+        self.names = [name for name, _ in self.accumulators]
+        self.values, self.collectors = initial_values(self.accumulators)
+        self.count = 0
+        self._env = None
+        # Compiled once; every send/feed runs the same specialized loop
+        self._loop = compile_fold(
+            self.variables, self.names, body, when,
+            collectors=self.collectors, stats=stats, memo=as_memo(memo)
+        )
+
+    def send(self, *values: Any) -> "FoldState":
+        """
+        Folds in one item, given as a value per variable.
+        """
+        if len(values) != len(self.variables):
+            raise ValueError(f"Expected a value for each of {', '.join(self.variables)}.")
+        self.values = self._loop([(value,) for value in values], self.values)
+        self.count += 1
+        self._env = None
+        return self
+
+    def feed(self, batch: Iterable[Any]) -> "FoldState":
+        """
+        Folds in every item of `batch`, in order, with one run of the compiled loop.
+        """
+        if len(self.variables) == 1:
+            items = list(batch)
+            self.values = self._loop([items], self.values)
+        else:
+            items = [tuple(item) for item in batch]
+            if any(len(item) != len(self.variables) for item in items):
+                raise ValueError(f"Expected a value for each of {', '.join(self.variables)}.")
+            columns = list(zip(*items)) or [()] * len(self.variables)
+            self.values = self._loop(columns, self.values)
+        self.count += len(items)
+        self._env = None
+        return self
+
+    def env(self) -> Dict[str, Any]:
+        if self._env is None:
+            # Frozen collectors (e.g. tuples) are rebuilt only after the state changes
+            self._env = final_env(self.names, self.values, self.collectors)
+        # The others would hand out the live container
+        return {
+            name: copy.copy(value) if collector and not collector.freeze else value
+            for (name, value), collector in zip(self._env.items(), self.collectors)
+        }
+
+    def result(self) -> Any:
+        env = self.env()
+        if self.result_function:
+            return call_with(self.result_function, env)
+        return env
+
+    def snapshot(self) -> "FoldState":
+        """
+        Independent copy of the current state; collector containers are copied too.
+        """
+        state = copy.copy(self)
+        state.values = [
+            copy.copy(value) if collector else value
+            for value, collector in zip(self.values, self.collectors)
+        ]
+        state._env = None
+        return state
+
+    def reset(self) -> "FoldState":
+        self.values, _ = initial_values(self.accumulators)
+        self.count = 0
+        self._env = None
+        return self
+
+# Example usage
+if __name__ == "__main__":
+    def body(total, largest, n):
+        return (total + n, max(largest, n))
+
+    running = FoldState(
+        accumulators=[("total", 0), ("largest", 0)],
+        variables=["n"],
+        body=body,
+        result=lambda total, largest: (total, largest)
+    )
+    running.feed([3, 1, 4])
+    print(f"After three: {running.result()}")  # Output: After three: (8, 4)
+    running.send(10)
+    print(f"After four: {running.result()}")  # Output: After four: (18, 10)
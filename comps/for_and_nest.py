@@ -1,23 +1,35 @@
+from comps.engine import always_true, compile_map
+from comps.numpy_backend import reduce_arrays
+from comps.sharded import parallel_search
 from typing import Iterable, Callable, Any, List, Tuple
-import itertools
+from concurrent.futures import Executor
 
 def for_and_nest(
     iterables: List[Tuple[str, Iterable]],
     predicate: Callable[..., bool],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    backend: str = "python",
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> bool:
     """
     Returns True if the predicate is True for all combinations in nested iterations.
+    With backend="numpy" the iterables are treated as arrays and the functions are called once on them.
+    With `workers`, `executor` or `shards`, the combinations are split into shards checked
+    in a process pool, and a False in any of them stops the rest (see comps.sharded).
     """
+    if backend != "python":
+        return bool(reduce_arrays(iterables, predicate, when, "all", backend=backend, nested=True))
+
+    if workers is not None or executor is not None or shards is not None:
+        return parallel_search(iterables, predicate, when, "all", nested=True, workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars) and not predicate(**vars):
-            return False
-    return True
+    return all(compile_map(iterable_names, predicate, when, nested=True)(iterable_values))
 
 # Example usage
 if __name__ == "__main__":
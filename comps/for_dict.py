@@ -1,28 +1,28 @@
+from comps.collector import collect_dict
+from comps.engine import always_true
 from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, Dict, Tuple, List
+from comps.memo import Memo
+from typing import Iterable, Callable, Any, Dict, Tuple, List, Union
 
 def for_dict(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Tuple[Any, Any]],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    memo: Union[bool, int, Memo] = None
 ) -> Dict[Any, Any]:
     """
     Collects results into a dictionary.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
     """
-    def comprehension_body(result, **vars):
-        key, value = body(**vars)
-        result[key] = value
-        return (result,)
-
-    result = for_fold(
-        accumulators=[("result", {})],
+    return for_fold(
+        accumulators=[("result", collect_dict(hidden=True))],
         iterables=iterables,
-        body=comprehension_body,
+        body=[body],
         when=when,
-        result=lambda result: result
+        result=lambda result: result,
+        memo=memo
     )
-    return result
 
 # Example usage
 if __name__ == "__main__":
@@ -1,25 +1,29 @@
+from comps.engine import always_true, compile_map
+from comps.sharded import sharded_reduce
 from typing import Iterable, Callable, Any, Dict, Tuple, List
-import itertools
+from concurrent.futures import Executor
 
 def for_dict_nest(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Tuple[Any, Any]],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> Dict[Any, Any]:
     """
     Collects results into a dictionary using nested iterations.
+    With `workers`, `executor` or `shards`, the product index space is split into contiguous
+    shards that run in a process pool (see comps.sharded).
     """
+    if workers is not None or executor is not None or shards is not None:
+        return sharded_reduce(iterables, body, when, "dict", workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
-    result = {}
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            key, value = body(**vars)
-            result[key] = value
-    return result
+    return dict(compile_map(iterable_names, body, when, nested=True)(iterable_values))
 
 # Example usage
 if __name__ == "__main__":
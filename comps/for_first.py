@@ -1,23 +1,30 @@
+from comps.engine import always_true, compile_map
+from comps.sharded import parallel_search
 from typing import Iterable, Callable, Any, List, Tuple, Optional
+from concurrent.futures import Executor
 
 def for_first(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> Optional[Any]:
     """
     Returns the first value returned by the body function that satisfies the when condition.
     If no item satisfies the condition, returns None.
+    With `workers`, `executor` or `shards`, contiguous shards are searched speculatively in
+    a process pool; a match stops the shards after it (see comps.sharded.search_shards).
     """
+    if workers is not None or executor is not None or shards is not None:
+        return parallel_search(iterables, body, when, "first", workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in zip(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            return body(**vars)
-    return None
+    return next(compile_map(iterable_names, body, when)(iterable_values), None)
 
 # Example usage
 if __name__ == "__main__":
@@ -1,23 +1,42 @@
+from comps.engine import always_true, compile_map
+from comps.sequences import InProduct
+from comps.sharded import parallel_search
 from typing import Iterable, Callable, Any, List, Tuple, Optional
+from concurrent.futures import Executor
 import itertools
 
 def for_first_nest(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    start: int = None,
+    stop: int = None,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> Optional[Any]:
     """
     Returns the first value returned by the body function that satisfies the when condition in nested iterations.
+    `start` and `stop` restrict the scan to that range of combination indices (clauses must
+    be sized and sliceable); the loop seeks to `start` without visiting earlier combinations.
+    With `workers`, `executor` or `shards`, contiguous ranges of combinations are searched in
+    a process pool, and shards after the first match stop early (see comps.sharded).
     """
+    if workers is not None or executor is not None or shards is not None:
+        return parallel_search(
+            iterables, body, when, "first", nested=True, start=start, stop=stop,
+            workers=workers, executor=executor, shards=shards
+        )
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            return body(**vars)
-    return None
+    loop = compile_map(iterable_names, body, when, nested=True)
+    if start is None and stop is None:
+        return next(loop(iterable_values), None)
+    blocks = InProduct(*iterable_values)[start:stop].blocks()
+    return next(itertools.chain.from_iterable(loop(clauses) for clauses in blocks), None)
 
 # Example usage
 if __name__ == "__main__":
@@ -1,23 +1,55 @@
+from comps.engine import always_true
 from comps.generator_comprehension import GeneratorComprehension
-from typing import Callable, Any, Iterable, List, Tuple
+from comps.instrumentation import LoopStats
+from comps.memo import Memo
+from typing import Callable, Any, Iterable, List, Tuple, Union
+from concurrent.futures import Executor
 
 def for_fold(
     accumulators: List[Tuple[str, Any]],
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Tuple[Any, ...]],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True,
-    result: Callable[..., Any] = None
+    when: Callable[..., bool] = always_true,
+    result: Callable[..., Any] = None,
+    combine: Callable[..., Tuple[Any, ...]] = None,
+    workers: int = None,
+    executor: Executor = None,
+    chunk_size: int = 10000,
+    stats: LoopStats = None,
+    memo: Union[bool, int, Memo] = None,
+    batch_size: int = None,
+    break_when: Callable[..., bool] = None,
+    final_when: Callable[..., bool] = None
 ) -> Any:
     """
     Simplified for_fold function using GeneratorComprehension.
+    An accumulator whose initial value is a Collector (see comps.collector) is updated
+    in place: the body returns the item to add to it instead of a new value.
+    With `combine`, chunks of the input are folded in parallel (a process pool of `workers`,
+    or `executor`) and the partial accumulator tuples are merged with `combine(left, right)`.
+    Passing a LoopStats as `stats` records per-stage counters and timings of the loop.
+    `memo` (True, a cache size or a Memo) caches pure body/when results by their arguments.
+    With `batch_size`, body and when are called once per chunk with lists of the iteration
+    variables: when returns one truth value per element, body the new accumulators.
+    `break_when` and `final_when` see the iteration variables and accumulators and stop the
+    fold early, like Racket's #:break (before the body) and #:final (after it).
     """
     comprehension = GeneratorComprehension(
         iterables=iterables,
         accumulators=accumulators,
         body=body,
         when=when,
-        result=result
+        result=result,
+        combine=combine,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+        stats=stats,
+        memo=memo,
+        batch_size=batch_size,
+        break_when=break_when,
+        final_when=final_when
     )
     return comprehension.run()
 
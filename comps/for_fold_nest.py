@@ -1,38 +1,51 @@
+from comps.engine import always_true
+from comps.generator_comprehension import GeneratorComprehension
+from comps.instrumentation import LoopStats
 from typing import Callable, Any, Iterable, List, Tuple
-from functools import reduce
-import itertools
+from concurrent.futures import Executor
 
 def for_fold_nest(
     accumulators: List[Tuple[str, Any]],
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Tuple[Any, ...]],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True,
-    result: Callable[..., Any] = None
+    when: Callable[..., bool] = always_true,
+    result: Callable[..., Any] = None,
+    combine: Callable[..., Tuple[Any, ...]] = None,
+    workers: int = None,
+    executor: Executor = None,
+    chunk_size: int = 10000,
+    stats: LoopStats = None,
+    break_when: Callable[..., bool] = None,
+    final_when: Callable[..., bool] = None
 ) -> Any:
     """
     Nested version of for_fold, performing nested iterations over iterables.
+    Clauses are pulled lazily, and an inner clause may be a function of the outer
+    variables, e.g. ("j", lambda i: range(i)).
+    `when` (or each predicate of a list of them) is checked at the outermost clause where
+    every name it takes is bound, so rejected outer values skip their whole inner product.
+    Passing a LoopStats as `stats` records per-stage counters and timings of the loop.
+    `break_when` and `final_when` stop every level of the nested loop, as in for_fold.
+    With `combine`, shards of about `chunk_size` combinations are folded in parallel and
+    merged in order, as in for_fold; sized clauses are split by index range.
     """
-    env = {name: initial for name, initial in accumulators}
-    accumulator_names = [name for name, _ in accumulators]
-    iterable_names = [name for name, _ in iterables]
-    iterable_values = [iterable for _, iterable in iterables]
-
-    for values in itertools.product(*iterable_values):
-        current_vars = {**env, **dict(zip(iterable_names, values))}
-
-        if when(**current_vars):
-            updated_values = body(**current_vars)
-            if not isinstance(updated_values, tuple):
-                raise TypeError("Body function must return a tuple of accumulator values.")
-            if len(updated_values) != len(accumulator_names):
-                raise ValueError("Body function must return a value for each accumulator.")
-            for name, value in zip(accumulator_names, updated_values):
-                env[name] = value
-    if result:
-        return result(**env)
-    else:
-        return {name: env[name] for name in accumulator_names}
+    comprehension = GeneratorComprehension(
+        iterables=iterables,
+        accumulators=accumulators,
+        body=body,
+        when=when,
+        result=result,
+        nested=True,
+        combine=combine,
+        workers=workers,
+        executor=executor,
+        chunk_size=chunk_size,
+        stats=stats,
+        break_when=break_when,
+        final_when=final_when
+    )
+    return comprehension.run()
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+from comps.engine import always_true, call_with, compile_fused
+from typing import Callable, Any, Iterable, List, Tuple
+
+# Initial value per collector kind; containers are built fresh for every run
+INITIAL = {
+    "sum": lambda: 0, "product": lambda: 1, "first": lambda: None, "last": lambda: None,
+    "and": lambda: True, "or": lambda: False,
+    "list": list, "tuple": list, "set": set, "dict": dict,
+}
+
+def for_fused(
+    iterables: List[Tuple[str, Iterable]],
+    outputs: List[Tuple[Any, ...]],
+    *,
+    when: Callable[..., bool] = always_true,
+    result: Callable[..., Any] = None,
+    nested: bool = False
+) -> Any:
+    """
+    Runs several collectors over the same bindings in one pass, so one-shot sources need
+    not be copied and the shared `when` is evaluated once per binding.
+    Each output is (name, kind, body) or (name, kind, body, when), where kind is one of
+    sum, product, list, tuple, set, dict, first, last, and, or; an output's own `when`
+    only filters that output. first/and/or outputs drop out once decided without
+    stopping the others.
+    Returns {name: result}, or `result` called with the names it takes.
+    """
+    for output in outputs:
+        if len(output) not in (3, 4):
+            raise ValueError("Each output must be (name, kind, body) or (name, kind, body, when).")
+        if output[1] not in INITIAL:
+            raise ValueError(f"Unsupported collector kind for {output[0]}: {output[1]}")
+    names = [output[0] for output in outputs]
+    kinds = [output[1] for output in outputs]
+    bodies = [output[2] for output in outputs]
+    filters = [output[3] if len(output) == 4 else always_true for output in outputs]
+
+    loop = compile_fused([name for name, _ in iterables], kinds, bodies, filters, when, nested=nested)
+    values = loop([iterable for _, iterable in iterables], [INITIAL[kind]() for kind in kinds])
+    env = {
+        name: tuple(value) if kind == "tuple" else value
+        for name, kind, value in zip(names, kinds, values)
+    }
+    if result:
+        return call_with(result, env)
+    return env
+
+# Example usage
+if __name__ == "__main__":
+    def readings():
+        yield from [3, -1, 4, 1, -5, 9, 2, 6]
+
+    summary = for_fused(
+        iterables=[("x", readings())],
+        outputs=[
+            ("total", "sum", lambda x: x),
+            ("count", "sum", lambda x: 1),
+            ("signs", "set", lambda x: x > 0),
+            ("first_negative", "first", lambda x: x, lambda x: x < 0),
+            ("all_small", "and", lambda x: abs(x) < 10),
+        ]
+    )
+    print(summary)
+    # Output: {'total': 19, 'count': 8, 'signs': {False, True}, 'first_negative': -1, 'all_small': True}
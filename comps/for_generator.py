@@ -1,24 +1,36 @@
+from comps.batching import batched_map
+from comps.engine import always_true, compile_map
+from comps.threaded import run_concurrently
 from typing import Iterable, Callable, Any, Generator, Tuple, List
 
 def for_generator(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    concurrency: int = None,
+    ordered: bool = True,
+    buffer_size: int = None,
+    batch_size: int = None
 ) -> Generator[Any, None, None]:
     """
     Returns a generator that yields results.
+    With `concurrency`, up to that many body calls run at once on a thread pool, with at most
+    `buffer_size` results in flight; `ordered=False` yields them as they complete.
+    With `batch_size`, body and when are called once per chunk with lists of values and
+    return one result (or truth value) per element.
     """
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    def generator():
-        for values in zip(*iterable_values):
-            vars = dict(zip(iterable_names, values))
-            if when(**vars):
-                yield body(**vars)
-
-    return generator()
+    if batch_size is not None:
+        if concurrency is not None:
+            raise ValueError("Batched generators cannot be combined with concurrency.")
+        return batched_map(iterable_names, iterable_values, body, when, batch_size)
+    if concurrency is not None:
+        calls = compile_map(iterable_names, body, when, deferred=True)(iterable_values)
+        return run_concurrently(calls, concurrency, ordered=ordered, buffer_size=buffer_size)
+    return compile_map(iterable_names, body, when)(iterable_values)
 
 # Example usage
 if __name__ == "__main__":
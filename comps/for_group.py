@@ -0,0 +1,117 @@
+from comps.engine import always_true, compile_group
+from dataclasses import dataclass
+from typing import Callable, Any, Dict, Iterable, List, Tuple, Union
+
+@dataclass(frozen=True)
+class Aggregation:
+    """
+    Custom per-key fold for for_group: every key starts from `initial` and each value
+    updates it with `step(state, value)`, which returns the new state (the state is
+    shared, not copied, so it must not be mutated in place). `merge(left, right)`
+    combines the states of two partial tables.
+    """
+    initial: Any
+    step: Callable[[Any, Any], Any]
+    merge: Callable[[Any, Any], Any] = None
+
+# Aggregate of a presized key before any value (None: no value yet)
+EMPTY = {"sum": 0, "count": 0}
+
+MERGES = {
+    "sum": lambda left, right: left + right,
+    "count": lambda left, right: left + right,
+    "min": min,
+    "max": max,
+    "list": lambda left, right: left + right,
+    "set": lambda left, right: left | right,
+}
+
+def for_group(
+    iterables: List[Tuple[str, Iterable]],
+    key: Callable[..., Any],
+    value: Callable[..., Any] = None,
+    agg: Union[str, Aggregation] = "list",
+    *,
+    when: Callable[..., bool] = always_true,
+    keys: Iterable[Any] = None,
+    table: Dict[Any, Any] = None,
+    nested: bool = False
+) -> Dict[Any, Any]:
+    """
+    Hash aggregation: groups the values returned by `value` by the key returned by `key`
+    and aggregates each group incrementally in a single pass. `agg` is "sum", "count",
+    "min", "max", "list", "set" or an Aggregation; the per-key state is the aggregate
+    itself (a number, or the list/set). Returns {key: aggregate} in first-seen key order.
+    `keys` presizes the table for keys known in advance; they come first in the result,
+    and those without values get the empty aggregate (0, [], set() or the Aggregation's
+    initial), except for min/max, where they are left out. Passing the `table` of an
+    earlier run continues aggregating into it, and merge_groups combines partial tables,
+    so chunks can be grouped separately, e.g. one table per worker.
+    """
+    kind = "fold" if isinstance(agg, Aggregation) else agg
+    if value is None and kind != "count":
+        raise ValueError("A value function is required unless agg is 'count'.")
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+
+    if table is None:
+        # dict.fromkeys allocates the hash table for all the known keys at once
+        empty = agg.initial if kind == "fold" else EMPTY.get(kind)
+        table = dict.fromkeys(keys, empty) if keys is not None else {}
+    loop = compile_group(iterable_names, key, value, kind, when, nested=nested)
+    if kind == "fold":
+        loop(iterable_values, table, agg.initial, agg.step)
+    else:
+        loop(iterable_values, table)
+    if keys is not None and kind in ("min", "max", "list", "set"):
+        # Known keys that received no value: empty containers, and no min/max at all
+        for group in [group for group, state in table.items() if state is None]:
+            if kind in ("min", "max"):
+                del table[group]
+            else:
+                table[group] = [] if kind == "list" else set()
+    return table
+
+def merge_groups(left: Dict[Any, Any], right: Dict[Any, Any], agg: Union[str, Aggregation] = "list") -> Dict[Any, Any]:
+    """
+    Combines two partial for_group tables into a new one, keeping the key order of `left`
+    followed by the keys only in `right`. The inputs are left untouched, also when the
+    result is passed back to for_group as `table`.
+    """
+    if isinstance(agg, Aggregation):
+        if agg.merge is None:
+            raise ValueError("Merging custom aggregations needs a merge function.")
+        merge = agg.merge
+    elif agg in MERGES:
+        merge = MERGES[agg]
+    else:
+        raise ValueError(f"Unsupported aggregation: {agg}")
+    # for_group appends to list and set states in place, so the result owns fresh ones
+    merged = {group: _owned(state) for group, state in left.items()}
+    for group, state in right.items():
+        merged[group] = merge(merged[group], state) if group in merged else _owned(state)
+    return merged
+
+def _owned(state: Any) -> Any:
+    return state.copy() if isinstance(state, (list, set)) else state
+
+# Example usage
+if __name__ == "__main__":
+    sales = [("north", 120), ("south", 80), ("north", 45), ("east", 200), ("south", 20)]
+
+    totals = for_group(
+        iterables=[("sale", sales)],
+        key=lambda sale: sale[0],
+        value=lambda sale: sale[1],
+        agg="sum"
+    )
+    print(f"Totals: {totals}")  # Output: Totals: {'north': 165, 'south': 100, 'east': 200}
+
+    spread = Aggregation((float("inf"), float("-inf")), lambda state, amount: (min(state[0], amount), max(state[1], amount)))
+    ranges = for_group(
+        iterables=[("sale", sales)],
+        key=lambda sale: sale[0],
+        value=lambda sale: sale[1],
+        agg=spread
+    )
+    print(f"Ranges: {ranges}")  # Output: Ranges: {'north': (45, 120), 'south': (20, 80), 'east': (200, 200)}
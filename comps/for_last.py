@@ -1,26 +1,32 @@
+from comps.engine import always_true, compile_map
+from comps.sequences import is_reversible, reversed_view
 from typing import Iterable, Callable, Any, List, Tuple, Optional
 
 def for_last(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true
 ) -> Optional[Any]:
     """
     Returns the last value returned by the body function that satisfies the when condition.
     If no item satisfies the condition, returns None.
+    Sized, indexable iterables are scanned from the end, stopping at the first match;
+    others are scanned forward. Either way `body` is called once, for the last match only.
     """
-    last_value = None
-    found = False
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in zip(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            last_value = body(**vars)
-            found = True
-    return last_value if found else None
+    if iterable_values and all(is_reversible(iterable) for iterable in iterable_values):
+        # zip stops at the shortest iterable, so every scan starts at the same index
+        length = min(len(iterable) for iterable in iterable_values)
+        backwards = [reversed_view(iterable, length) for iterable in iterable_values]
+        return next(compile_map(iterable_names, body, when)(backwards), None)
+
+    last_call = None
+    for last_call in compile_map(iterable_names, body, when, deferred=True)(iterable_values):
+        pass
+    return last_call() if last_call is not None else None
 
 # Example usage
 if __name__ == "__main__":
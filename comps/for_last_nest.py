@@ -1,3 +1,5 @@
+from comps.engine import always_true, compile_map, is_dependent
+from comps.sequences import InProduct, is_reversible, reversed_view
 from typing import Iterable, Callable, Any, List, Tuple, Optional
 import itertools
 
@@ -5,22 +7,37 @@ def for_last_nest(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    start: int = None,
+    stop: int = None
 ) -> Optional[Any]:
     """
     Returns the last value returned by the body function that satisfies the when condition in nested iterations.
+    `start` and `stop` restrict the scan to that range of combination indices (clauses must
+    be sized and sliceable); the loop seeks to `start` without visiting earlier combinations.
+    Sized, indexable clauses are otherwise scanned from the last combination backwards,
+    stopping at the first match; either way `body` is called once, for the last match only.
     """
-    last_value = None
-    found = False
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            last_value = body(**vars)
-            found = True
-    return last_value if found else None
+    if start is None and stop is None and all(
+        is_reversible(iterable) and not is_dependent(iterable) for iterable in iterable_values
+    ):
+        # The product of the reversed clauses is the product in reverse order
+        backwards = [reversed_view(iterable) for iterable in iterable_values]
+        return next(compile_map(iterable_names, body, when, nested=True)(backwards), None)
+
+    loop = compile_map(iterable_names, body, when, nested=True, deferred=True)
+    if start is None and stop is None:
+        calls = loop(iterable_values)
+    else:
+        blocks = InProduct(*iterable_values)[start:stop].blocks()
+        calls = itertools.chain.from_iterable(loop(clauses) for clauses in blocks)
+    last_call = None
+    for last_call in calls:
+        pass
+    return last_call() if last_call is not None else None
 
 # Example usage
 if __name__ == "__main__":
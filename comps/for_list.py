@@ -1,29 +1,47 @@
+from comps.batching import batched_map
+from comps.collector import collect_list
+from comps.engine import always_true, compile_map
 from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, List, Tuple
+from comps.memo import Memo
+from comps.sequences import LengthHinted, known_length
+from typing import Iterable, Callable, Any, List, Tuple, Union
 
 def for_list(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    memo: Union[bool, int, Memo] = None,
+    batch_size: int = None
 ) -> List[Any]:
     """
     Collects results into a list.
+    Without `when`, sized inputs (see comps.sequences) let the list be allocated at its final size.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
+    With `batch_size`, body and when receive lists of values per chunk and return one
+    result (or truth value) per element.
     """
-    def comprehension_body(result, **vars):
-        item = body(**vars)
-        return (result + [item],)
+    iterable_values = [iterable for _, iterable in iterables]
+    if batch_size is not None:
+        if memo:
+            raise ValueError("Batched folds cannot be combined with combine, stats or memo.")
+        iterable_names = [name for name, _ in iterables]
+        return list(batched_map(iterable_names, iterable_values, body, when, batch_size))
 
-    # Use a different variable name to store the result
-    final_result = for_fold(
-        accumulators=[("result", [])],
+    length = known_length(iterable_values) if when is always_true and not memo else None
+    if length is not None:
+        # Every binding yields one item, so the list is allocated once at its final size
+        results = compile_map([name for name, _ in iterables], body)(iterable_values)
+        return list(LengthHinted(results, length))
+
+    return for_fold(
+        accumulators=[("result", collect_list(hidden=True))],
         iterables=iterables,
-        body=comprehension_body,
+        body=[body],
         when=when,
-        result=lambda result: result
+        result=lambda result: result,
+        memo=memo
     )
-    return final_result
-
 
 # Example usage
 if __name__ == "__main__":
@@ -1,25 +1,32 @@
+from comps.engine import always_true, compile_map
+from comps.sequences import LengthHinted, known_length
+from comps.sharded import sharded_reduce
 from typing import Iterable, Callable, Any, List, Tuple
-import itertools
+from concurrent.futures import Executor
 
 def for_list_nest(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> List[Any]:
     """
     Collects results into a list using nested iterations.
+    With `workers`, `executor` or `shards`, the product index space is split into contiguous
+    shards that run in a process pool (see comps.sharded).
     """
+    if workers is not None or executor is not None or shards is not None:
+        return sharded_reduce(iterables, body, when, "list", workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
-    result = []
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            item = body(**vars)
-            result.append(item)
-    return result
+    results = compile_map(iterable_names, body, when, nested=True)(iterable_values)
+    length = known_length(iterable_values, nested=True) if when is always_true else None
+    return list(results if length is None else LengthHinted(results, length))
 
 # Example usage
 if __name__ == "__main__":
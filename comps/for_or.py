@@ -1,23 +1,35 @@
+from comps.engine import always_true, compile_map
+from comps.numpy_backend import reduce_arrays
+from comps.sharded import parallel_search
 from typing import Iterable, Callable, Any, List, Tuple
+from concurrent.futures import Executor
 
 def for_or(
     iterables: List[Tuple[str, Iterable]],
     predicate: Callable[..., bool],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    backend: str = "python",
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> bool:
     """
     Returns True if the predicate is True for any item, False otherwise.
+    With backend="numpy" the iterables are treated as arrays and the functions are called once on them.
+    With `workers`, `executor` or `shards`, contiguous shards are searched in a process pool;
+    the first True returns at once and the other shards stop at their next poll.
     """
+    if backend != "python":
+        return bool(reduce_arrays(iterables, predicate, when, "any", backend=backend))
+
+    if workers is not None or executor is not None or shards is not None:
+        return parallel_search(iterables, predicate, when, "any", workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in zip(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            if predicate(**vars):
-                return True
-    return False
+    return any(compile_map(iterable_names, predicate, when)(iterable_values))
 
 # Example usage
 if __name__ == "__main__":
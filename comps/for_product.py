@@ -1,26 +1,30 @@
-from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, List, Tuple
+from comps.engine import always_true, compile_map
+from comps.memo import Memo, as_memo
+from comps.numpy_backend import reduce_arrays
+from typing import Iterable, Callable, Any, List, Tuple, Union
+from functools import reduce
+import operator
 
 def for_product(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    backend: str = "python",
+    memo: Union[bool, int, Memo] = None
 ) -> Any:
     """
     Multiplies the values returned by the body function over the iterables.
+    With backend="numpy" the iterables are treated as arrays and the functions are called once on them.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
     """
-    def comprehension_body(product, **vars):
-        return (product * body(**vars),)
-
-    result = for_fold(
-        accumulators=[("product", 1)],
-        iterables=iterables,
-        body=comprehension_body,
-        when=when,
-        result=lambda product: product
-    )
-    return result
+    if backend != "python":
+        return reduce_arrays(iterables, body, when, "prod", backend=backend)
+
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+
+    return reduce(operator.mul, compile_map(iterable_names, body, when, memo=as_memo(memo))(iterable_values), 1)
 
 # Example usage
 if __name__ == "__main__":
@@ -1,27 +1,28 @@
+from comps.collector import collect_set
+from comps.engine import always_true
 from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, Set, Tuple, List
+from comps.memo import Memo
+from typing import Iterable, Callable, Any, Set, Tuple, List, Union
 
 def for_set(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    memo: Union[bool, int, Memo] = None
 ) -> Set[Any]:
     """
     Collects results into a set.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
     """
-    def comprehension_body(result, **vars):
-        item = body(**vars)
-        return (result | {item},)
-
-    result = for_fold(
-        accumulators=[("result", set())],
+    return for_fold(
+        accumulators=[("result", collect_set(hidden=True))],
         iterables=iterables,
-        body=comprehension_body,
+        body=[body],
         when=when,
-        result=lambda result: result
+        result=lambda result: result,
+        memo=memo
     )
-    return result
 
 # Example usage
 if __name__ == "__main__":
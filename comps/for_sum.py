@@ -1,26 +1,30 @@
-from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, List, Tuple
+from comps.engine import always_true, compile_map
+from comps.memo import Memo, as_memo
+from comps.numpy_backend import reduce_arrays
+from typing import Iterable, Callable, Any, List, Tuple, Union
+from functools import reduce
+import operator
 
 def for_sum(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    backend: str = "python",
+    memo: Union[bool, int, Memo] = None
 ) -> Any:
     """
     Sums up the values returned by the body function over the iterables.
+    With backend="numpy" the iterables are treated as arrays and the functions are called once on them.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
     """
-    def comprehension_body(sum, **vars):
-        return (sum + body(**vars),)
-
-    result = for_fold(
-        accumulators=[("sum", 0)],
-        iterables=iterables,
-        body=comprehension_body,
-        when=when,
-        result=lambda sum: sum
-    )
-    return result
+    if backend != "python":
+        return reduce_arrays(iterables, body, when, "sum", backend=backend)
+
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+
+    return reduce(operator.add, compile_map(iterable_names, body, when, memo=as_memo(memo))(iterable_values), 0)
 
 # Example usage
 if __name__ == "__main__":
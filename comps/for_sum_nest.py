@@ -1,24 +1,37 @@
+from comps.engine import always_true, compile_map
+from comps.numpy_backend import reduce_arrays
+from comps.sharded import sharded_reduce
 from typing import Iterable, Callable, Any, List, Tuple
-import itertools
+from concurrent.futures import Executor
+from functools import reduce
+import operator
 
 def for_sum_nest(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    backend: str = "python",
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
 ) -> Any:
     """
     Sums up the values returned by the body function over nested iterations.
+    With backend="numpy" the iterables are treated as arrays and the functions are called once on them.
+    With `workers`, `executor` or `shards`, the product index space is split into contiguous
+    shards that run in a process pool (see comps.sharded).
     """
-    total = 0
+    if backend != "python":
+        return reduce_arrays(iterables, body, when, "sum", backend=backend, nested=True)
+
+    if workers is not None or executor is not None or shards is not None:
+        return sharded_reduce(iterables, body, when, "sum", workers=workers, executor=executor, shards=shards)
+
     iterable_names = [name for name, _ in iterables]
     iterable_values = [iterable for _, iterable in iterables]
 
-    for values in itertools.product(*iterable_values):
-        vars = dict(zip(iterable_names, values))
-        if when(**vars):
-            total += body(**vars)
-    return total
+    return reduce(operator.add, compile_map(iterable_names, body, when, nested=True)(iterable_values), 0)
 
 # Example usage
 if __name__ == "__main__":
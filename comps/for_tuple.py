@@ -1,27 +1,37 @@
+from comps.collector import collect_tuple
+from comps.engine import always_true, compile_map
 from comps.for_fold import for_fold
-from typing import Iterable, Callable, Any, Tuple, List
+from comps.memo import Memo
+from comps.sequences import LengthHinted, known_length
+from typing import Iterable, Callable, Any, Tuple, List, Union
 
 def for_tuple(
     iterables: List[Tuple[str, Iterable]],
     body: Callable[..., Any],
     *,
-    when: Callable[..., bool] = lambda **kwargs: True
+    when: Callable[..., bool] = always_true,
+    memo: Union[bool, int, Memo] = None
 ) -> Tuple[Any, ...]:
     """
     Collects results into a tuple.
+    Without `when`, sized inputs (see comps.sequences) let the tuple be allocated at its final size.
+    `memo` caches results of a pure body and when by their arguments (see comps.memo).
     """
-    def comprehension_body(result, **vars):
-        item = body(**vars)
-        return (result + (item,),)
+    iterable_values = [iterable for _, iterable in iterables]
+    length = known_length(iterable_values) if when is always_true and not memo else None
+    if length is not None:
+        # Every binding yields one item, so the tuple is allocated once at its final size
+        results = compile_map([name for name, _ in iterables], body)(iterable_values)
+        return tuple(LengthHinted(results, length))
 
-    result = for_fold(
-        accumulators=[("result", ())],
+    return for_fold(
+        accumulators=[("result", collect_tuple(hidden=True))],
         iterables=iterables,
-        body=comprehension_body,
+        body=[body],
         when=when,
-        result=lambda result: result
+        result=lambda result: result,
+        memo=memo
     )
-    return result
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,77 @@
+from comps.engine import always_true, compile_map
+from comps.sequences import known_length
+from typing import Iterable, Callable, Any, List, Tuple
+from array import array
+import itertools
+
+BACKENDS = ("array", "numpy")
+
+def for_vector(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    *,
+    when: Callable[..., bool] = always_true,
+    dtype: str = "d",
+    length: int = None,
+    fill: Any = 0,
+    backend: str = "array"
+) -> Any:
+    """
+    Collects numeric results into a packed buffer instead of a list of boxed objects:
+    an array.array of typecode `dtype`, or with backend="numpy" an ndarray of that dtype.
+    Like Racket's for/vector #:length, a given `length` stops the loop once the buffer is
+    full and sets slots left unfilled to `fill`. The buffer grows geometrically, or is
+    allocated once at its final size when that is known (NumPy, sized inputs).
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported backend: {backend}")
+    if length is not None and length < 0:
+        raise ValueError("length must be a non-negative integer.")
+    iterable_names = [name for name, _ in iterables]
+    iterable_values = [iterable for _, iterable in iterables]
+    results = compile_map(iterable_names, body, when)(iterable_values)
+    if length is not None:
+        # Stop pulling once the buffer is full
+        results = itertools.islice(results, length)
+
+    if backend == "array":
+        # array() appends in C, over-allocating geometrically as it grows
+        buffer = array(dtype, results)
+        if length is not None and len(buffer) < length:
+            buffer.extend(array(dtype, [fill]) * (length - len(buffer)))
+        return buffer
+
+    try:
+        import numpy as np
+    except ImportError as error:
+        raise ImportError("backend='numpy' requires NumPy to be installed.") from error
+    available = known_length(iterable_values) if when is always_true else None
+    count = length if length is not None else available
+    if count is not None and available is not None and available >= count:
+        # The exact size is known: fill a single preallocated buffer
+        return np.fromiter(results, dtype=dtype, count=count)
+    buffer = np.fromiter(results, dtype=dtype)
+    if length is not None and len(buffer) < length:
+        buffer = np.concatenate([buffer, np.full(length - len(buffer), fill, dtype=dtype)])
+    return buffer
+
+# Example usage
+if __name__ == "__main__":
+    numbers = range(1, 6)
+
+    def half(n):
+        return n / 2
+
+    halves = for_vector(
+        iterables=[("n", numbers)],
+        body=half
+    )
+    print(f"Halves: {halves}")  # Output: Halves: array('d', [0.5, 1.0, 1.5, 2.0, 2.5])
+
+    first_three = for_vector(
+        iterables=[("n", numbers)],
+        body=lambda n: n * n,
+        dtype="q",
+        length=3
+    )
+    print(f"First three squares: {first_three}")  # Output: First three squares: array('q', [1, 4, 9])
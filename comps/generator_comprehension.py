@@ -1,4 +1,11 @@
-from typing import Callable, Any, Iterable, List, Tuple, Dict
+from comps.batching import batched_fold
+from comps.collector import initial_values, final_env
+from comps.engine import always_true, call_with, compile_fold
+from comps.instrumentation import LoopStats
+from comps.memo import Memo, as_memo
+from comps.parallel import parallel_fold
+from typing import Callable, Any, Iterable, List, Tuple, Dict, Union
+from concurrent.futures import Executor
 
 class GeneratorComprehension:
     def __init__(
@@ -6,47 +13,81 @@ class GeneratorComprehension:
         iterables: List[Tuple[str, Iterable]],
         accumulators: List[Tuple[str, Any]],
         body: Callable[..., Tuple[Any, ...]],
-        when: Callable[..., bool] = lambda **kwargs: True,
-        result: Callable[..., Any] = None
+        when: Callable[..., bool] = always_true,
+        result: Callable[..., Any] = None,
+        nested: bool = False,
+        combine: Callable[..., Tuple[Any, ...]] = None,
+        workers: int = None,
+        executor: Executor = None,
+        chunk_size: int = 10000,
+        stats: LoopStats = None,
+        memo: Union[bool, int, Memo] = None,
+        batch_size: int = None,
+        break_when: Callable[..., bool] = None,
+        final_when: Callable[..., bool] = None
     ):
+        if combine is None and (workers is not None or executor is not None):
+            raise ValueError("Parallel folds need a combine function to merge partial accumulators.")
+        if combine is not None and stats is not None:
+            raise ValueError("stats cannot be collected from a parallel fold.")
+        if combine is not None and memo:
+            raise ValueError("memo cannot be shared across the workers of a parallel fold.")
+        if batch_size is not None and isinstance(body, (list, tuple)):
+            raise ValueError("Batched folds need a single body function.")
+        if batch_size is not None and (combine is not None or stats is not None or memo):
+            raise ValueError("Batched folds cannot be combined with combine, stats or memo.")
+        if (break_when is not None or final_when is not None) and (combine is not None or batch_size is not None):
+            raise ValueError("break_when and final_when need a sequential, unbatched fold.")
         self.iterables = iterables
         self.accumulators = accumulators
         self.body = body
         self.when = when
         self.result = result
+        self.nested = nested
+        self.combine = combine
+        self.workers = workers
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.stats = stats
+        self.memo = as_memo(memo)
+        self.batch_size = batch_size
+        self.break_when = break_when
+        self.final_when = final_when
 
     def run(self) -> Any:
-        # Initialize accumulators
-        env = {name: initial for name, initial in self.accumulators}
         accumulator_names = [name for name, _ in self.accumulators]
         iterable_names = [name for name, _ in self.iterables]
         iterables = [iterable for _, iterable in self.iterables]
 
-        # Iterate over the iterables
-        for values in zip(*iterables):
-            # Update the environment with current iterable values
-            current_vars = {**env, **dict(zip(iterable_names, values))}
+        # Collector accumulators start from a fresh container that is updated in place
+        initial, collectors = initial_values(self.accumulators)
 
-            # Apply the filter
-            if not self.when(**current_vars):
-                continue
-
-            # Call the body function
-            updated_values = self.body(**current_vars)
-
-            if not isinstance(updated_values, tuple):
-                raise TypeError("Body function must return a tuple of accumulator values.")
-
-            if len(updated_values) != len(accumulator_names):
-                raise ValueError("Body function must return a value for each accumulator.")
-
-            # Update accumulators
-            for name, value in zip(accumulator_names, updated_values):
-                env[name] = value
+        if self.batch_size is not None:
+            # One body call per chunk, with lists of the bound variables
+            final_values = batched_fold(
+                iterable_names, accumulator_names, self.body, self.when, self.batch_size,
+                iterables, initial, collectors, nested=self.nested
+            )
+        elif self.combine is not None:
+            # Map-reduce: fold chunks in a pool and merge the partial accumulators in order
+            final_values = parallel_fold(
+                self.iterables, self.accumulators, self.body, self.when, self.combine,
+                nested=self.nested, workers=self.workers, executor=self.executor,
+                chunk_size=self.chunk_size
+            )
+        else:
+            # Build the specialized loop once; it passes each callable only the names it takes
+            loop = compile_fold(
+                iterable_names, accumulator_names, self.body, self.when,
+                nested=self.nested, collectors=collectors, stats=self.stats, memo=self.memo,
+                break_when=self.break_when, final_when=self.final_when
+            )
+            final_values = loop(iterables, initial)
+        env = final_env(accumulator_names, final_values, collectors)
 
         # Apply the result function if provided
         if self.result:
-            return self.result(**env)
+            return call_with(self.result, env)
         else:
             # Default result is to return the accumulators as a dictionary
-            return {name: env[name] for name in accumulator_names}
+            return env
@@ -0,0 +1,144 @@
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Any, Iterable, Dict
+from time import perf_counter_ns
+
+@dataclass
+class LoopStats:
+    """
+    Counters and timings collected by an instrumented comprehension loop.
+    Pass one as `stats=` to opt in; loops without it run the uninstrumented code.
+    Times are in nanoseconds. `loop_ns` is everything that is not the source, `when`
+    or `body`: accumulator updates, the loop itself and the timing calls.
+    `pulled` counts bindings, not items: a binding is complete once the last source
+    (zipped) or the innermost clause (nested) yields, so only those pulls are counted.
+    """
+    pulled: int = 0
+    when_calls: int = 0
+    rejected: int = 0
+    body_calls: int = 0
+    source_ns: int = 0
+    when_ns: int = 0
+    body_ns: int = 0
+    total_ns: int = 0
+    # Body latency histogram: upper bound in ns (a power of two) -> number of calls
+    body_histogram: Dict[int, int] = field(default_factory=dict)
+
+    @property
+    def loop_ns(self) -> int:
+        return max(self.total_ns - self.source_ns - self.when_ns - self.body_ns, 0)
+
+    def summary(self) -> str:
+        lines = [
+            f"pulled {self.pulled}, when calls {self.when_calls}, rejected {self.rejected}, body calls {self.body_calls}",
+            f"total {self.total_ns / 1e6:.3f} ms: source {self.source_ns / 1e6:.3f} ms, "
+            f"when {self.when_ns / 1e6:.3f} ms, body {self.body_ns / 1e6:.3f} ms, "
+            f"updates/loop {self.loop_ns / 1e6:.3f} ms",
+        ]
+        for bound in sorted(self.body_histogram):
+            lines.append(f"  body <= {bound:>12,} ns: {self.body_histogram[bound]}")
+        return "\n".join(lines)
+
+def timed_when(stats: LoopStats, when: Callable[..., bool]) -> Callable[..., bool]:
+    @wraps(when)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        hit = when(*args, **kwargs)
+        stats.when_ns += perf_counter_ns() - start
+        stats.when_calls += 1
+        if not hit:
+            stats.rejected += 1
+        return hit
+    return wrapper
+
+def timed_body(stats: LoopStats, body: Callable[..., Any]) -> Callable[..., Any]:
+    histogram = stats.body_histogram
+
+    @wraps(body)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        value = body(*args, **kwargs)
+        elapsed = perf_counter_ns() - start
+        stats.body_ns += elapsed
+        stats.body_calls += 1
+        bound = 1 << elapsed.bit_length()
+        histogram[bound] = histogram.get(bound, 0) + 1
+        return value
+    return wrapper
+
+def timed_source(stats: LoopStats, source: Any, counted: bool = True) -> Any:
+    """
+    Times every item pulled from `source`, and counts it in `pulled` when `counted`.
+    One-shot iterators stay one-shot, and dependent nested clauses time the iterables
+    they return.
+    """
+    if callable(source) and not hasattr(source, "__iter__"):
+        @wraps(source)
+        def clause(*args, **kwargs):
+            return timed_source(stats, source(*args, **kwargs), counted)
+        return clause
+    if iter(source) is source:
+        return _TimedIterator(stats, source, counted)
+    return _TimedIterable(stats, source, counted)
+
+def _timed_sources(stats: LoopStats, sources: Iterable) -> list:
+    # Only the last source completes a binding, so only its pulls are counted
+    sources = list(sources)
+    return [timed_source(stats, source, i == len(sources) - 1) for i, source in enumerate(sources)]
+
+def timed_run(stats: LoopStats, run: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps a compiled loop so its sources are timed and its total time is recorded.
+    """
+    def wrapper(sources: Iterable, *args):
+        start = perf_counter_ns()
+        try:
+            return run(_timed_sources(stats, sources), *args)
+        finally:
+            stats.total_ns += perf_counter_ns() - start
+    return wrapper
+
+def timed_generator(stats: LoopStats, run: Callable[..., Iterable]) -> Callable[..., Iterable]:
+    """
+    Like timed_run for compiled generators: only time spent inside the generator counts.
+    """
+    def wrapper(sources: Iterable, *args):
+        generator = run(_timed_sources(stats, sources), *args)
+        while True:
+            start = perf_counter_ns()
+            try:
+                value = next(generator)
+            except StopIteration:
+                return
+            finally:
+                stats.total_ns += perf_counter_ns() - start
+            yield value
+    return wrapper
+
+class _TimedIterator:
+    def __init__(self, stats: LoopStats, iterator: Iterable, counted: bool = True):
+        self.stats = stats
+        self.iterator = iterator
+        self.counted = counted
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = perf_counter_ns()
+        try:
+            item = next(self.iterator)
+        finally:
+            self.stats.source_ns += perf_counter_ns() - start
+        if self.counted:
+            self.stats.pulled += 1
+        return item
+
+class _TimedIterable:
+    def __init__(self, stats: LoopStats, iterable: Iterable, counted: bool = True):
+        self.stats = stats
+        self.iterable = iterable
+        self.counted = counted
+
+    def __iter__(self):
+        return _TimedIterator(self.stats, iter(self.iterable), self.counted)
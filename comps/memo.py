@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Any, Union
+
+class Memo:
+    """
+    Bounded LRU cache for pure `body`/`when` functions, keyed by the arguments the loop
+    passes them (the bound iteration variables, plus any accumulators the function takes).
+    Each wrapped function gets its own cache of at most `maxsize` entries; statistics are
+    shared. Calls whose arguments are unhashable bypass the cache and count as `uncached`.
+    """
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return (
+            f"Memo(maxsize={self.maxsize}, hits={self.hits}, misses={self.misses}, "
+            f"uncached={self.uncached}, evictions={self.evictions})"
+        )
+
+    def wrap(self, function: Callable[..., Any]) -> Callable[..., Any]:
+        cache = OrderedDict()
+        maxsize = self.maxsize
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                key = (args, frozenset(kwargs.items())) if kwargs else args
+                value = cache[key]
+            except KeyError:
+                pass
+            except TypeError:
+                self.uncached += 1
+                return function(*args, **kwargs)
+            else:
+                self.hits += 1
+                cache.move_to_end(key)
+                return value
+            self.misses += 1
+            value = function(*args, **kwargs)
+            cache[key] = value
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+                self.evictions += 1
+            return value
+        return wrapper
+
+def as_memo(memo: Union[bool, int, Memo, None]) -> Memo:
+    """
+    Normalizes a `memo=` argument: None/False disable it, True uses the default size,
+    an int sets `maxsize`, and a Memo instance is used as is (to read its statistics).
+    """
+    if memo is None or memo is False:
+        return None
+    if memo is True:
+        return Memo()
+    if isinstance(memo, Memo):
+        return memo
+    if isinstance(memo, int):
+        return Memo(maxsize=memo)
+    raise TypeError(f"Unsupported memo option: {memo!r}")
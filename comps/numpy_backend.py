@@ -0,0 +1,63 @@
+from comps.engine import always_true, call_with
+from typing import Callable, Any, Iterable, List, Tuple
+
+REDUCTIONS = ("sum", "prod", "all", "any")
+
+# Result over no bindings, the same as the Python backend's (np.sum of an empty array is 0.0)
+EMPTY = {"sum": 0, "prod": 1, "all": True, "any": False}
+
+def reduce_arrays(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    reduction: str,
+    *,
+    backend: str = "numpy",
+    nested: bool = False
+) -> Any:
+    """
+    Vectorized reduction: calls `body` and `when` once on whole arrays and reduces
+    the selected values with np.sum/np.prod/np.all/np.any.
+    Flat iterables are zipped (truncated to the shortest); nested ones form a broadcast grid.
+    Without any binding the result is the Python identity (0, 1, True or False), as with
+    the Python backend; otherwise it is a NumPy scalar.
+    """
+    if backend != "numpy":
+        raise ValueError(f"Unsupported backend: {backend}")
+    if reduction not in REDUCTIONS:
+        raise ValueError(f"Unsupported reduction: {reduction}")
+    try:
+        import numpy as np
+    except ImportError as error:
+        raise ImportError("backend='numpy' requires NumPy to be installed.") from error
+
+    iterable_names = [name for name, _ in iterables]
+    arrays = [np.asarray(iterable) for _, iterable in iterables]
+    if any(array.ndim != 1 for array in arrays):
+        raise ValueError("backend='numpy' requires one-dimensional iterables.")
+
+    if nested:
+        # Each iterable varies along its own axis, like itertools.product
+        shape = tuple(len(array) for array in arrays)
+        arrays = list(np.ix_(*arrays)) if arrays else []
+    else:
+        length = min((len(array) for array in arrays), default=0)
+        shape = (length,)
+        arrays = [array[:length] for array in arrays]
+
+    if 0 in shape:
+        return EMPTY[reduction]
+    env = dict(zip(iterable_names, arrays))
+    values = np.broadcast_to(call_with(body, env), shape)
+    reducer = getattr(np, reduction)
+    # `when` may be a list of predicates that must all hold, as with the Python backend
+    whens = [
+        predicate for predicate in (when if isinstance(when, (list, tuple)) else [when])
+        if predicate is not always_true
+    ]
+    if not whens:
+        return reducer(values)
+    mask = np.ones(shape, dtype=bool)
+    for predicate in whens:
+        mask &= np.broadcast_to(np.asarray(call_with(predicate, env), dtype=bool), shape)
+    return reducer(values, where=mask)
@@ -0,0 +1,104 @@
+from comps.collector import initial_values
+from comps.engine import compile_bindings, compile_fold
+from comps.sequences import is_sliceable, known_length
+from comps.sharded import fold_shard, is_shardable, require_picklable, run_shards
+from typing import Callable, Any, Iterable, List, Tuple, Sequence
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+import itertools
+import os
+
+def fold_chunk(
+    iterable_names: List[str],
+    accumulators: List[Tuple[str, Any]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    columns: Sequence[Sequence[Any]]
+) -> Tuple[Any, ...]:
+    """
+    Folds one chunk of bindings from the initial accumulators. Runs inside a worker.
+    """
+    initial, collectors = initial_values(accumulators)
+    loop = compile_fold(iterable_names, [name for name, _ in accumulators], body, when, collectors=collectors)
+    return loop(columns, initial)
+
+def parallel_fold(
+    iterables: List[Tuple[str, Iterable]],
+    accumulators: List[Tuple[str, Any]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    combine: Callable[[Tuple[Any, ...], Tuple[Any, ...]], Tuple[Any, ...]],
+    *,
+    nested: bool = False,
+    workers: int = None,
+    executor: Executor = None,
+    chunk_size: int = 10000
+) -> Tuple[Any, ...]:
+    """
+    Splits the bindings into chunks, folds each chunk in a process pool and merges the
+    partial accumulators with `combine(left, right)` in chunk order.
+    The initial accumulators must be identities for `combine`, since every chunk starts from them.
+    At most two chunks per worker are in flight, so the input is never fully materialized.
+    Nested loops over sized clauses are split into shards of about `chunk_size` combinations
+    by index range instead (see comps.sharded).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+    iterable_names = [name for name, _ in iterables]
+    sources = [iterable for _, iterable in iterables]
+    require_picklable(executor, accumulators, body, when)
+    if nested and is_shardable(sources):
+        # Shards of the product index space: the driver never lists the combinations
+        merged = run_shards(
+            fold_shard, (iterable_names, accumulators, body, when), sources,
+            lambda left, right: _merge(combine, left, right, len(accumulators)),
+            workers=workers, executor=executor,
+            shards=-(-known_length(sources, nested=True) // chunk_size)
+        )
+        return tuple(initial_values(accumulators)[0]) if merged is None else merged
+    limit = 2 * (workers or os.cpu_count() or 1)
+
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    in_flight = deque()
+    merged = None
+    try:
+        for position, columns in enumerate(_chunks(iterable_names, sources, nested, chunk_size)):
+            if position == 0:
+                # Items of one kind: memoryview lines, say, fail on the first chunk
+                require_picklable(executor, columns)
+            in_flight.append(executor.submit(fold_chunk, iterable_names, accumulators, body, when, columns))
+            if len(in_flight) >= limit:
+                merged = _merge(combine, merged, in_flight.popleft().result(), len(accumulators))
+        while in_flight:
+            merged = _merge(combine, merged, in_flight.popleft().result(), len(accumulators))
+    finally:
+        if owned:
+            executor.shutdown(cancel_futures=True)
+
+    if merged is None:
+        return tuple(initial_values(accumulators)[0])
+    return merged
+
+def _chunks(iterable_names: List[str], sources: List[Any], nested: bool, chunk_size: int) -> Iterable[List[Sequence[Any]]]:
+    """
+    Columns of each chunk of bindings. Zipped sized sequences (lists, ranges, comps.sequences)
+    are sliced directly, so an in_range is shipped as a small range rather than its items.
+    """
+    length = None if nested else known_length(sources)
+    if length is not None and all(is_sliceable(source) for source in sources):
+        for start in range(0, length, chunk_size):
+            yield [source[start:start + chunk_size] for source in sources]
+        return
+    rows = compile_bindings(iterable_names, nested=nested)(sources)
+    for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+        yield list(zip(*chunk))
+
+def _merge(combine: Callable[..., Tuple[Any, ...]], merged: Any, partial: Tuple[Any, ...], count: int) -> Tuple[Any, ...]:
+    if merged is None:
+        return partial
+    merged = combine(merged, partial)
+    if not isinstance(merged, tuple) or len(merged) != count:
+        raise ValueError("Combine function must return a tuple with a value for each accumulator.")
+    return merged
@@ -0,0 +1,85 @@
+from comps.engine import compile_pipeline
+from typing import Callable, Any, Iterable, Iterator, List, Tuple
+
+class Pipeline:
+    """
+    Lazy chain of map/filter/flat_map/take_while stages over comprehension clauses.
+    Building a pipeline only records the stages; a terminal (iteration, to_list, sum,
+    fold, first, ...) fuses the whole chain into a single generated loop, so a stage
+    costs one call per element rather than a generator frame of its own.
+    Functions of stages before the first map take the bound names, like a body; later
+    ones take the current value.
+    """
+    def __init__(self, iterables: List[Tuple[str, Iterable]], *, nested: bool = False, stages: Tuple = ()):
+        self.iterables = list(iterables)
+        self.nested = nested
+        self.stages = tuple(stages)
+
+    def __repr__(self):
+        names = ", ".join(name for name, _ in self.iterables)
+        return f"Pipeline({names}: {' -> '.join(kind for kind, _ in self.stages) or 'values'})"
+
+    def _then(self, kind: str, function: Callable[..., Any]) -> "Pipeline":
+        return Pipeline(self.iterables, nested=self.nested, stages=self.stages + ((kind, function),))
+
+    def map(self, function: Callable[..., Any]) -> "Pipeline":
+        return self._then("map", function)
+
+    def filter(self, predicate: Callable[..., bool]) -> "Pipeline":
+        return self._then("filter", predicate)
+
+    def flat_map(self, function: Callable[..., Iterable]) -> "Pipeline":
+        return self._then("flat_map", function)
+
+    def take_while(self, predicate: Callable[..., bool]) -> "Pipeline":
+        return self._then("take_while", predicate)
+
+    def _run(self, terminal: str, *args: Any, method: str = None) -> Any:
+        loop = compile_pipeline(
+            [name for name, _ in self.iterables], self.stages, terminal,
+            method=method, nested=self.nested
+        )
+        return loop([iterable for _, iterable in self.iterables], *args)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._run("yield")
+
+    def to_list(self) -> List[Any]:
+        return self._run("collect", [], method="append")
+
+    def to_tuple(self) -> Tuple[Any, ...]:
+        return tuple(self.to_list())
+
+    def to_set(self) -> set:
+        return self._run("collect", set(), method="add")
+
+    def sum(self, start: Any = 0) -> Any:
+        return self._run("sum", start)
+
+    def fold(self, function: Callable[[Any, Any], Any], initial: Any) -> Any:
+        return self._run("reduce", initial, function)
+
+    def first(self, default: Any = None) -> Any:
+        return self._run("first", default)
+
+    def last(self, default: Any = None) -> Any:
+        return self._run("last", default)
+
+    def count(self) -> int:
+        return self.map(lambda *value: 1).sum()
+
+# Example usage
+if __name__ == "__main__":
+    lines = ["3 apples", "", "10 pears", "# skipped", "7 plums", "END", "5 figs"]
+
+    total = (
+        Pipeline([("line", lines)])
+        .filter(lambda line: line and not line.startswith("#"))
+        .take_while(lambda line: line != "END")
+        .map(lambda line: int(line.split()[0]))
+        .sum()
+    )
+    print(f"Total fruit: {total}")  # Output: Total fruit: 20
+
+    words = Pipeline([("line", lines)]).flat_map(lambda line: line.split()).filter(str.isalpha).to_list()
+    print(f"Words: {words}")  # Output: Words: ['apples', 'pears', 'skipped', 'plums', 'END', 'figs']
@@ -0,0 +1,382 @@
+from comps.file_sources import MappedRecords
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+import array
+import itertools
+import sys
+
+class InRange:
+    """
+    Lazy arithmetic sequence, like Racket's in-range: knows its length and stride,
+    supports random access and slicing (a slice is another InRange), and converts to
+    a NumPy array with np.arange rather than element by element.
+    """
+    def __init__(self, start: int, stop: int = None, step: int = 1):
+        if stop is None:
+            start, stop = 0, start
+        self.range = range(start, stop, step)
+
+    @property
+    def start(self) -> int:
+        return self.range.start
+
+    @property
+    def stop(self) -> int:
+        return self.range.stop
+
+    @property
+    def stride(self) -> int:
+        return self.range.step
+
+    def __repr__(self):
+        return f"in_range({self.start}, {self.stop}, {self.stride})"
+
+    def __len__(self):
+        return len(self.range)
+
+    def __iter__(self):
+        return iter(self.range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            part = self.range[index]
+            return InRange(part.start, part.stop, part.step)
+        return self.range[index]
+
+    def __reduce__(self):
+        return (InRange, (self.start, self.stop, self.stride))
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+        return np.arange(self.start, self.stop, self.stride, dtype=dtype)
+
+class InNaturals:
+    """
+    The infinite sequence start, start + 1, ... (Racket's in-naturals).
+    It has no length; zipped with sized sequences, it never ends the loop first.
+    """
+    def __init__(self, start: int = 0):
+        if start < 0:
+            raise ValueError("in_naturals starts at a non-negative integer.")
+        self.start = start
+        self.stride = 1
+
+    def __repr__(self):
+        return f"in_naturals({self.start})"
+
+    def __iter__(self):
+        return itertools.count(self.start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.stop is None or index.stop < 0 or (index.start or 0) < 0:
+                raise ValueError("Slices of in_naturals need non-negative bounds and a stop.")
+            start = index.start or 0
+            return InRange(self.start + start, self.start + index.stop, index.step or 1)
+        if index < 0:
+            raise IndexError("in_naturals has no last element.")
+        return self.start + index
+
+class InIndexed:
+    """
+    (index, item) pairs of a sized sequence, like enumerate but with length and random access.
+    """
+    def __init__(self, sequence: Sequence[Any]):
+        self.sequence = sequence
+        self.stride = 1
+
+    def __repr__(self):
+        return f"in_indexed({self.sequence!r})"
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __iter__(self):
+        return enumerate(self.sequence)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return InSlice(self, index.start, index.stop, index.step)
+        if index < 0:
+            index += len(self.sequence)
+        return (index, self.sequence[index])
+
+class InSlice:
+    """
+    View of `sequence[start:stop:step]` that does not copy it. Slicing a view gives a
+    view of the same underlying sequence.
+    """
+    def __init__(self, sequence: Sequence[Any], start: int = None, stop: int = None, step: int = None):
+        self.sequence = sequence
+        self.indices = range(len(sequence))[slice(start, stop, step)]
+
+    @property
+    def stride(self) -> int:
+        return self.indices.step
+
+    def __repr__(self):
+        return f"in_slice({self.sequence!r}, {self.indices.start}, {self.indices.stop}, {self.indices.step})"
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        if self.indices.step == 1 and isinstance(self.sequence, (list, tuple)):
+            return itertools.islice(self.sequence, self.indices.start, self.indices.stop)
+        if self.indices.step == -1 and self.indices.start == len(self.sequence) - 1 and self.indices.stop == -1:
+            return reversed(self.sequence)
+        sequence = self.sequence
+        return (sequence[i] for i in self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = InSlice.__new__(InSlice)
+            view.sequence = self.sequence
+            view.indices = self.indices[index]
+            return view
+        return self.sequence[self.indices[index]]
+
+class InValue:
+    """
+    The one-element sequence of `value` (Racket's in-value), e.g. to bind a constant in a nested loop.
+    """
+    def __init__(self, value: Any):
+        self.value = value
+        self.stride = 1
+
+    def __repr__(self):
+        return f"in_value({self.value!r})"
+
+    def __len__(self):
+        return 1
+
+    def __iter__(self):
+        return iter((self.value,))
+
+    def __getitem__(self, index):
+        return (self.value,)[index]
+
+def unrank(index: int, sizes: Sequence[int]) -> List[int]:
+    """
+    Mixed-radix digits of `index` in the product of clauses of `sizes`, outermost first.
+    """
+    digits = []
+    for size in reversed(sizes):
+        index, digit = divmod(index, size)
+        digits.append(digit)
+    return digits[::-1]
+
+def product_blocks(sizes: Sequence[int], start: int, stop: int) -> Iterator[Tuple[List[int], int, int, int]]:
+    """
+    Covers the index range [start, stop) of a product with as few blocks as possible.
+    Each block is (digits, level, low, high): the clauses before `level` fixed to `digits`,
+    clause `level` running from `low` to `high`, and every later clause in full.
+    There must be at least one clause (see InProduct.blocks for the empty product).
+    """
+    count = len(sizes)
+    steps = [1] * count
+    for level in range(count - 2, -1, -1):
+        steps[level] = steps[level + 1] * sizes[level + 1]
+    index = start
+    while index < stop:
+        digits = unrank(index, sizes)
+        # The outermost clause whose later digits are all zero and one step of which still fits
+        level = next(
+            level for level in range(count)
+            if not any(digits[level + 1:]) and index + steps[level] <= stop
+        )
+        high = min(sizes[level], digits[level] + (stop - index) // steps[level])
+        yield digits[:level], level, digits[level], high
+        index += (high - digits[level]) * steps[level]
+
+class InProduct:
+    """
+    The nested product of sized, sliceable clauses as a sequence of combination tuples:
+    its length is the cardinality, product[k] computes the k-th combination directly,
+    and slices are views over an index range. Iteration runs itertools.product over
+    blocks of the range; iterate(position) gives a resumable ProductIterator instead.
+    """
+    def __init__(self, *clauses: Sequence[Any], start: int = 0, stop: int = None):
+        self.clauses = clauses
+        self.sizes = [len(clause) for clause in clauses]
+        total = 1
+        for size in self.sizes:
+            total *= size
+        self.indices = range(total)[start:stop]
+
+    @property
+    def stride(self) -> int:
+        return 1
+
+    def __repr__(self):
+        return f"in_product({', '.join(map(repr, self.clauses))})[{self.indices.start}:{self.indices.stop}]"
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                raise ValueError("Product slices must be contiguous.")
+            part = self.indices[index]
+            return InProduct(*self.clauses, start=part.start, stop=part.stop)
+        digits = unrank(self.indices[index], self.sizes)
+        return tuple(clause[digit] for clause, digit in zip(self.clauses, digits))
+
+    def blocks(self, start: int = 0) -> Iterator[List[Any]]:
+        """
+        Clause lists whose nested products, in order, cover this range from its `start`-th
+        combination on.
+        """
+        if not self.clauses:
+            # The product of no clauses has exactly one (empty) combination
+            if start < len(self.indices):
+                yield []
+            return
+        for digits, level, low, high in product_blocks(self.sizes, self.indices.start + start, self.indices.stop):
+            fixed = [[clause[digit]] for clause, digit in zip(self.clauses, digits)]
+            yield fixed + [self.clauses[level][low:high]] + list(self.clauses[level + 1:])
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return itertools.chain.from_iterable(itertools.product(*clauses) for clauses in self.blocks())
+
+    def iterate(self, position: int = 0) -> "ProductIterator":
+        return ProductIterator(self, position)
+
+class ProductIterator:
+    """
+    Iterator over an InProduct that tracks how far it got: `position` is the number of
+    combinations consumed, which product.iterate(position) resumes from, and `progress`
+    the fraction done.
+    """
+    def __init__(self, product: InProduct, position: int = 0):
+        if not 0 <= position <= len(product):
+            raise ValueError("position is outside the product.")
+        self.product = product
+        self.position = position
+        self.iterator = iter(product[position:])
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> Tuple[Any, ...]:
+        combination = next(self.iterator)
+        self.position += 1
+        return combination
+
+    def __length_hint__(self):
+        return len(self.product) - self.position
+
+    @property
+    def progress(self) -> float:
+        return self.position / len(self.product) if len(self.product) else 1.0
+
+def in_range(start: int, stop: int = None, step: int = 1) -> InRange:
+    return InRange(start, stop, step)
+
+def in_naturals(start: int = 0) -> InNaturals:
+    return InNaturals(start)
+
+def in_indexed(sequence: Sequence[Any]) -> InIndexed:
+    return InIndexed(sequence)
+
+def in_slice(sequence: Sequence[Any], start: int = None, stop: int = None, step: int = None) -> InSlice:
+    return InSlice(sequence, start, stop, step)
+
+def in_value(value: Any) -> InValue:
+    return InValue(value)
+
+def in_product(*clauses: Sequence[Any]) -> InProduct:
+    return InProduct(*clauses)
+
+def known_length(sources: Sequence[Any], *, nested: bool = False) -> Optional[int]:
+    """
+    Number of bindings a loop over `sources` produces, when every source is sized:
+    the shortest for zipped sources (infinite in_naturals do not count), the product
+    for nested clauses. None when it cannot be known without iterating.
+    """
+    lengths = []
+    for source in sources:
+        if isinstance(source, InNaturals) and not nested:
+            continue
+        if not hasattr(source, "__len__") or (callable(source) and not hasattr(source, "__iter__")):
+            return None
+        lengths.append(len(source))
+    if nested:
+        count = 1
+        for length in lengths:
+            count *= length
+        return count
+    return min(lengths) if lengths else None
+
+def is_reversible(source: Any) -> bool:
+    """
+    Whether `source` is a positional sequence of known length (list, range, str, NumPy
+    array, comps.sequences, ...) that can be walked from the end without iterating it.
+    Other objects with __len__ and __getitem__, such as lookup tables that iterate their
+    keys, may index by something other than position, so they are not.
+    """
+    return is_sliceable(source) and hasattr(source, "__len__")
+
+def reversed_view(source: Sequence[Any], length: int = None) -> Any:
+    """
+    Re-iterable view of the first `length` items of `source` (default: all), last first.
+    """
+    length = len(source) if length is None else length
+    if isinstance(source, (range, InRange)) and length == len(source):
+        return source[::-1]
+    if isinstance(source, MappedRecords):
+        # Indexing would leave the file mapped after the scan; its own walk unmaps it
+        return InReversed(source[:length]) if length else ()
+    return InSlice(source, length - 1, None, -1) if length else ()
+
+class InReversed:
+    """
+    Re-iterable view of a sized source, last first, through its __reversed__.
+    """
+    def __init__(self, source: Sequence[Any]):
+        self.source = source
+
+    def __len__(self):
+        return len(self.source)
+
+    def __iter__(self) -> Iterator[Any]:
+        return reversed(self.source)
+
+# Sources indexed by position whose slices are sources of the same kind. Sequence
+# alone is not enough: a deque is one but cannot be sliced.
+POSITIONAL = (
+    list, tuple, range, str, bytes, bytearray, array.array,
+    InRange, InNaturals, InIndexed, InSlice, InValue, InProduct, MappedRecords
+)
+
+def is_sliceable(source: Any) -> bool:
+    """
+    Whether `source[start:stop]` gives the same items as iterating that part of it.
+    """
+    if isinstance(source, POSITIONAL):
+        return True
+    # An ndarray can only exist once NumPy has been imported
+    numpy = sys.modules.get("numpy")
+    return numpy is not None and isinstance(source, numpy.ndarray)
+
+class LengthHinted:
+    """
+    One-shot iterable over `iterator` that reports `length` through __length_hint__, so
+    list() and tuple() preallocate. It is not an iterator itself: iterating it hands out
+    the underlying iterator, so loops pay nothing per item. Consume it in a single pass.
+    """
+    def __init__(self, iterator: Iterator[Any], length: int):
+        self.iterator = iterator
+        self.length = length
+
+    def __iter__(self):
+        return self.iterator
+
+    def __length_hint__(self):
+        return self.length
+
+# Example usage
+if __name__ == "__main__":
+    print(list(in_range(0, 10, 3)), len(in_range(0, 10, 3)))  # Output: [0, 3, 6, 9] 4
+    print(list(zip(in_naturals(1), "abc")))  # Output: [(1, 'a'), (2, 'b'), (3, 'c')]
+    print(in_indexed("xyz")[2], list(in_slice("abcdef", 1, None, 2)))  # Output: (2, 'z') ['b', 'd', 'f']
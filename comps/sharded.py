@@ -0,0 +1,377 @@
+from comps.collector import initial_values
+from comps.engine import compile_fold, compile_map, is_dependent
+from comps.sequences import InProduct, is_sliceable, known_length, product_blocks
+from typing import Callable, Any, Iterable, Iterator, List, Tuple, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from functools import reduce
+from multiprocessing import Manager
+import itertools
+import operator
+import os
+import pickle
+import threading
+import time
+
+# reduction -> (reduce one shard's values, merge two partial results)
+REDUCTIONS = {
+    "sum": (lambda values: reduce(operator.add, values, 0), operator.add),
+    "product": (lambda values: reduce(operator.mul, values, 1), operator.mul),
+    "list": (list, operator.add),
+    "dict": (dict, lambda left, right: {**left, **right}),
+}
+
+def product_shards(sizes: Sequence[int], shards: int) -> Tuple[int, List[range]]:
+    """
+    Splits the product index space into at most `shards` contiguous ranges of equal size.
+    Ranges are over the smallest prefix of clauses with at least `shards` combinations,
+    so each shard runs whole inner products. Returns (prefix length, ranges).
+    """
+    prefix = 0
+    count = 1
+    while prefix < len(sizes) and count < shards:
+        count *= sizes[prefix]
+        prefix += 1
+    shards = max(min(shards, count), 1)
+    bounds = [count * i // shards for i in range(shards + 1)]
+    return prefix, [range(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+
+def shard_clauses(sources: Sequence[Any], prefix: int, shard: range) -> Iterator[List[Any]]:
+    """
+    Clause lists whose nested products, run in order, cover the `shard` of prefix indices.
+    """
+    if prefix == 0:
+        yield list(sources)
+        return
+    sizes = [len(source) for source in sources[:prefix]]
+    for digits, level, low, high in product_blocks(sizes, shard.start, shard.stop):
+        fixed = [[source[digit]] for source, digit in zip(sources, digits)]
+        yield fixed + [sources[level][low:high]] + list(sources[level + 1:])
+
+def map_shard(
+    iterable_names: List[str],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    reduction: str,
+    blocks: List[List[Any]]
+) -> Any:
+    """
+    Reduces the body values of one shard, given as its blocks of clauses (see
+    shard_clauses). Runs inside a worker.
+    """
+    loop = compile_map(iterable_names, body, when, nested=True)
+    values = itertools.chain.from_iterable(loop(clauses) for clauses in blocks)
+    return REDUCTIONS[reduction][0](values)
+
+def fold_shard(
+    iterable_names: List[str],
+    accumulators: List[Tuple[str, Any]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    blocks: List[List[Any]]
+) -> Tuple[Any, ...]:
+    """
+    Folds one shard, given as its blocks of clauses, from the initial accumulators.
+    Runs inside a worker.
+    """
+    values, collectors = initial_values(accumulators)
+    loop = compile_fold(iterable_names, [name for name, _ in accumulators], body, when, nested=True, collectors=collectors)
+    for clauses in blocks:
+        values = loop(clauses, values)
+    return tuple(values)
+
+def is_shardable(sources: Sequence[Any]) -> bool:
+    # Every clause must be sized and sliceable: lists, ranges, comps.sequences
+    return all(is_sliceable(source) and not is_dependent(source) for source in sources)
+
+def require_picklable(executor: Executor, *values: Any) -> None:
+    """
+    Raises TypeError unless `values` can be sent to the process pool that `executor` is
+    (None: an owned one). A task that fails to pickle leaves the pool's workers hanging,
+    so the check runs before anything is submitted.
+    """
+    if executor is not None and not isinstance(executor, ProcessPoolExecutor):
+        return
+    try:
+        pickle.dumps(values)
+    except (pickle.PicklingError, AttributeError, TypeError) as error:
+        raise TypeError(
+            f"Parallel work must be picklable to run in a process pool ({error}); "
+            "use module-level functions and picklable items, or pass a thread pool as executor."
+        ) from error
+
+def run_shards(
+    task: Callable[..., Any],
+    args: Tuple[Any, ...],
+    sources: Sequence[Any],
+    merge: Callable[[Any, Any], Any],
+    *,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
+) -> Any:
+    """
+    Runs `task(*args, blocks)` for every shard in a process pool (or `executor`) and
+    merges the results in shard order. The driver never lists the combinations: a
+    shard's blocks (see shard_clauses) hold only the part of the prefix clauses it
+    covers, plus the inner clauses. Returns None when there is nothing to run.
+    """
+    if not is_shardable(sources):
+        raise ValueError("Sharded nested loops need sized, sliceable clauses (lists, ranges, comps.sequences).")
+    require_picklable(executor, task, args)
+    sizes = [len(source) for source in sources]
+    if 0 in sizes:
+        return None
+    prefix, ranges = product_shards(sizes, shards or 4 * (workers or os.cpu_count() or 1))
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    futures = []
+    try:
+        for shard in ranges:
+            blocks = list(shard_clauses(sources, prefix, shard))
+            if not futures:
+                require_picklable(executor, blocks)
+            futures.append(executor.submit(task, *args, blocks))
+        merged = None
+        for position, future in enumerate(futures):
+            partial = future.result()
+            merged = partial if position == 0 else merge(merged, partial)
+        return merged
+    finally:
+        # After a failed shard, pending ones never start and the caller does not wait
+        for future in futures:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+def sharded_reduce(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    reduction: str,
+    *,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None
+) -> Any:
+    """
+    Parallel nested map-reduce with one of REDUCTIONS.
+    """
+    iterable_names = [name for name, _ in iterables]
+    sources = [iterable for _, iterable in iterables]
+    reducer, merge = REDUCTIONS[reduction]
+    merged = run_shards(
+        map_shard, (iterable_names, body, when, reduction), sources, merge,
+        workers=workers, executor=executor, shards=shards
+    )
+    return reducer(()) if merged is None else merged
+
+# Seconds between two reads of the shared cutoff in a running shard
+POLL_INTERVAL = 0.01
+
+class Cancellation:
+    """
+    How a running search shard learns that the search no longer needs it. The driver
+    keeps a cutoff position in a multiprocessing Manager, shared with every worker, and
+    lowers it once results are known: the shards after the cutoff stop. Shards read it
+    while pulling items, at most every POLL_INTERVAL seconds, so a cancelled shard stops
+    within one poll interval plus the item in progress.
+    """
+    def __init__(self, cutoff: Any, position: int):
+        self.cutoff = cutoff
+        self.position = position
+        self.stopped = False
+        self.deadline = 0.0
+
+    def __getstate__(self):
+        return {"cutoff": self.cutoff, "position": self.position, "stopped": False, "deadline": 0.0}
+
+    def check(self) -> bool:
+        if self.stopped:
+            return True
+        now = time.monotonic()
+        if now >= self.deadline:
+            self.deadline = now + POLL_INTERVAL
+            try:
+                self.stopped = self.cutoff.value < self.position
+            except (EOFError, OSError):
+                # The driver and its manager are gone, so nobody waits for this shard
+                self.stopped = True
+        return self.stopped
+
+    def watch(self, source: Iterable) -> "Watched":
+        return Watched(source, self)
+
+class Watched:
+    """
+    Re-iterable view of a clause that ends early once its shard is cancelled.
+    """
+    def __init__(self, source: Iterable, cancellation: Cancellation):
+        self.source = source
+        self.cancellation = cancellation
+
+    def __iter__(self) -> Iterator[Any]:
+        check = self.cancellation.check
+        for item in self.source:
+            if check():
+                return
+            yield item
+
+def search_shard(
+    iterable_names: List[str],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    mode: str,
+    nested: bool,
+    shard: Any,
+    cancellation: Cancellation
+) -> Tuple[bool, Any]:
+    """
+    Searches one shard (a list of zipped slices, or blocks of clauses when nested) and returns
+    (decisive, value): the first match for "first", a True for "any", a False for "all".
+    Every clause is watched, so the scan ends early once `cancellation` says the search
+    is settled; the result of a cancelled shard is never used. Runs inside a worker.
+    """
+    loop = compile_map(iterable_names, body, when, nested=nested)
+    if nested:
+        values = itertools.chain.from_iterable(
+            loop([cancellation.watch(clause) for clause in clauses]) for clauses in shard
+        )
+    else:
+        # zip stops at the first source, so watching it is enough
+        values = loop([cancellation.watch(shard[0])] + shard[1:])
+    if mode == "first":
+        for value in values:
+            return True, value
+        return False, None
+    if mode == "any":
+        return (True, True) if any(values) else (False, False)
+    return (False, True) if all(values) else (True, False)
+
+def search_shards(
+    task: Callable[..., Tuple[bool, Any]],
+    jobs: List[Tuple[Any, ...]],
+    *,
+    ordered: bool,
+    workers: int = None,
+    executor: Executor = None
+) -> Tuple[bool, Any]:
+    """
+    Runs `task(*job, cancellation)` for every job speculatively and returns the
+    (decisive, value) that settles the search.
+    Unordered, the first decisive shard to finish wins and every other shard is cancelled.
+    Ordered, a decisive shard cancels the shards after it and wins once every shard
+    before it has finished without a decisive result.
+    Pending shards never start, and running ones stop at their next poll (see
+    Cancellation); the driver returns without waiting for them.
+    """
+    if jobs:
+        require_picklable(executor, task, jobs[0])
+    manager = Manager()
+    cutoff = manager.Value("i", len(jobs))
+    owned = executor is None
+    if owned:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    positions = {}
+    try:
+        positions = {
+            executor.submit(task, *job, Cancellation(cutoff, position)): position
+            for position, job in enumerate(jobs)
+        }
+        pending = set(positions)
+        best = None
+        settled = set()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                position = positions[future]
+                decisive, value = future.result()
+                settled.add(position)
+                if not decisive:
+                    continue
+                if not ordered:
+                    return decisive, value
+                if best is None or position < best[0]:
+                    best = (position, value)
+                    cutoff.value = position
+                    for other in pending:
+                        if positions[other] > position:
+                            other.cancel()
+            pending = {future for future in pending if not future.cancelled()}
+            if best is not None and all(position in settled for position in range(best[0])):
+                return True, best[1]
+        return (True, best[1]) if best is not None else (False, None)
+    finally:
+        # Nothing is needed any more: stop every running shard and do not wait for them
+        cutoff.value = -1
+        for future in positions:
+            future.cancel()
+        if owned:
+            executor.shutdown(wait=False, cancel_futures=True)
+        _shutdown_when_done(manager, list(positions))
+
+def _shutdown_when_done(manager: Any, futures: List[Any]) -> None:
+    # Running shards still poll the cutoff, so the manager outlives them
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def finished(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            manager.shutdown()
+
+    if not futures:
+        manager.shutdown()
+    for future in futures:
+        future.add_done_callback(finished)
+
+def parallel_search(
+    iterables: List[Tuple[str, Iterable]],
+    body: Callable[..., Any],
+    when: Callable[..., bool],
+    mode: str,
+    *,
+    nested: bool = False,
+    workers: int = None,
+    executor: Executor = None,
+    shards: int = None,
+    start: int = None,
+    stop: int = None
+) -> Any:
+    """
+    Speculative parallel for_first ("first"), for_or ("any") or for_and ("all") over
+    contiguous shards of sized, sliceable inputs: zipped slices, or index ranges of the
+    nested product (optionally restricted to [start, stop)). "first" keeps sequential
+    semantics: a later shard's match counts only once all earlier shards have none.
+    """
+    iterable_names = [name for name, _ in iterables]
+    sources = [iterable for _, iterable in iterables]
+    if nested:
+        if not is_shardable(sources):
+            raise ValueError("Parallel search needs sized, sliceable clauses (lists, ranges, comps.sequences).")
+        space = InProduct(*sources)[start:stop]
+        total = len(space)
+        # Blocks hold only the slices a shard covers, not the whole clause lists
+        split = lambda low, high: list(space[low:high].blocks())
+    else:
+        total = known_length(sources)
+        if total is None or not all(is_sliceable(source) for source in sources):
+            raise ValueError("Parallel search needs sized, sliceable iterables (lists, ranges, comps.sequences).")
+        split = lambda low, high: [source[low:high] for source in sources]
+
+    count = max(min(shards or 4 * (workers or os.cpu_count() or 1), total), 1)
+    bounds = [total * i // count for i in range(count + 1)]
+    jobs = [
+        (iterable_names, body, when, mode, nested, split(low, high))
+        for low, high in zip(bounds, bounds[1:]) if high > low
+    ]
+    decisive, value = search_shards(search_shard, jobs, ordered=mode == "first", workers=workers, executor=executor)
+    if mode == "first":
+        return value
+    if mode == "any":
+        return decisive
+    return not decisive
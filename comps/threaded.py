@@ -0,0 +1,49 @@
+from typing import Callable, Any, Iterable, Generator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+def run_concurrently(
+    calls: Iterable[Callable[[], Any]],
+    concurrency: int,
+    *,
+    ordered: bool = True,
+    buffer_size: int = None
+) -> Generator[Any, None, None]:
+    """
+    Runs zero-argument calls on a pool of `concurrency` threads and yields their results.
+    At most `buffer_size` calls (default: twice the concurrency) are in flight or waiting
+    to be yielded, so `calls` is pulled lazily and may be infinite.
+    With `ordered`, results come back in input order; otherwise as they complete.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be a positive integer.")
+    buffer_size = buffer_size or 2 * concurrency
+    if buffer_size < concurrency:
+        raise ValueError("buffer_size must be at least the concurrency.")
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        if ordered:
+            pending = deque()
+            for call in calls:
+                pending.append(executor.submit(call))
+                # Yield finished results at the head early; block only when the buffer is full
+                while pending and (len(pending) >= buffer_size or pending[0].done()):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = set()
+            for call in calls:
+                pending.add(executor.submit(call))
+                if len(pending) >= buffer_size:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        # Runs on exhaustion, errors, and when the consumer stops early
+        executor.shutdown(wait=True, cancel_futures=True)
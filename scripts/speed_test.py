@@ -1,4 +1,24 @@
-import timeit
+"""
+Scaling benchmarks for the comps comprehension functions.
+
+Every case is timed over a sweep of input sizes next to the equivalent native Python
+comprehension or builtin, with warm-up runs and repeated measurements.
+
+    python scripts/speed_test.py                          # print a table
+    python scripts/speed_test.py --json run.json          # also save the results
+    python scripts/speed_test.py --compare old.json new.json --threshold 0.1
+"""
+import argparse
+import functools
+import json
+import math
+import operator
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Any, Dict, List, Tuple
+
 from comps.for_fold import for_fold
 from comps.for_list import for_list
 from comps.for_set import for_set
@@ -23,187 +43,197 @@ from comps.for_product_nest import for_product_nest
 from comps.for_first_nest import for_first_nest
 from comps.for_last_nest import for_last_nest
 
-# Sample data for testing
-numbers = list(range(1, 100))
-letters = ['a', 'b', 'c', 'd']
-
-# Define functions to benchmark
-def benchmark_for_fold():
-    def body(sum, n):
-        return (sum + n,)
-    for_fold(
-        accumulators=[("sum", 0)],
-        iterables=[("n", numbers)],
-        body=body,
-        result=lambda sum: sum
-    )
-
-def benchmark_for_list():
-    for_list(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_set():
-    for_set(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_dict():
-    for_dict(
-        iterables=[("n", numbers)],
-        body=lambda n: (n, n * n)
-    )
-
-def benchmark_for_tuple():
-    for_tuple(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_generator():
-    list(for_generator(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    ))
-
-def benchmark_for_and():
-    for_and(
-        iterables=[("n", numbers)],
-        predicate=lambda n: n % 2 == 0
-    )
-
-def benchmark_for_or():
-    for_or(
-        iterables=[("n", numbers)],
-        predicate=lambda n: n % 2 == 0
-    )
-
-def benchmark_for_sum():
-    for_sum(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_product():
-    for_product(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_first():
-    for_first(
-        iterables=[("n", numbers)],
-        body=lambda n: n,
-        when=lambda n: n == 50
-    )
-
-def benchmark_for_last():
-    for_last(
-        iterables=[("n", numbers)],
-        body=lambda n: n
-    )
-
-def benchmark_for_fold_nest():
-    def body(sum, i, j):
-        return (sum + ord(j) * i,)
-    for_fold_nest(
-        accumulators=[("sum", 0)],
-        iterables=[("i", numbers), ("j", letters)],
-        body=body,
-        result=lambda sum: sum
-    )
-
-def benchmark_for_list_nest():
-    for_list_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, j)
-    )
-
-def benchmark_for_dict_nest():
-    for_dict_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, ord(j))
-    )
-
-def benchmark_for_tuple_nest():
-    for_tuple_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, j)
-    )
-
-def benchmark_for_generator_nest():
-    list(for_generator_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, j)
-    ))
-
-def benchmark_for_and_nest():
-    for_and_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        predicate=lambda i, j: i % 2 == 0
-    )
-
-def benchmark_for_or_nest():
-    for_or_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        predicate=lambda i, j: i % 2 == 0
-    )
-
-def benchmark_for_sum_nest():
-    for_sum_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: ord(j) * i
-    )
-
-def benchmark_for_product_nest():
-    for_product_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: ord(j) * i
-    )
-
-def benchmark_for_first_nest():
-    for_first_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, j),
-        when=lambda i, j: i == 50 and j == 'b'
-    )
-
-def benchmark_for_last_nest():
-    for_last_nest(
-        iterables=[("i", numbers), ("j", letters)],
-        body=lambda i, j: (i, j)
-    )
-
-# List of benchmark functions
-benchmarks = [
-    ("for_fold", benchmark_for_fold),
-    ("for_list", benchmark_for_list),
-    ("for_set", benchmark_for_set),
-    ("for_dict", benchmark_for_dict),
-    ("for_tuple", benchmark_for_tuple),
-    ("for_generator", benchmark_for_generator),
-    ("for_and", benchmark_for_and),
-    ("for_or", benchmark_for_or),
-    ("for_sum", benchmark_for_sum),
-    ("for_product", benchmark_for_product),
-    ("for_first", benchmark_for_first),
-    ("for_last", benchmark_for_last),
-    ("for_fold_nest", benchmark_for_fold_nest),
-    ("for_list_nest", benchmark_for_list_nest),
-    ("for_dict_nest", benchmark_for_dict_nest),
-    ("for_tuple_nest", benchmark_for_tuple_nest),
-    ("for_generator_nest", benchmark_for_generator_nest),
-    ("for_and_nest", benchmark_for_and_nest),
-    ("for_or_nest", benchmark_for_or_nest),
-    ("for_sum_nest", benchmark_for_sum_nest),
-    ("for_product_nest", benchmark_for_product_nest),
-    ("for_first_nest", benchmark_for_first_nest),
-    ("for_last_nest", benchmark_for_last_nest),
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000]
+
+# Each case: (name, make_data(size), comps version, native baseline)
+Case = Tuple[str, Callable[[int], Any], Callable[[Any], Any], Callable[[Any], Any]]
+
+def flat(size: int) -> List[int]:
+    return list(range(1, size + 1))
+
+def grid(size: int) -> Tuple[List[int], List[int]]:
+    # Two clauses whose product has about `size` combinations
+    side = max(int(math.isqrt(size)), 1)
+    return list(range(1, side + 1)), list(range(1, side + 1))
+
+CASES: List[Case] = [
+    ("for_fold", flat,
+     lambda n: for_fold([("sum", 0)], [("n", n)], lambda sum, n: (sum + n,), result=lambda sum: sum),
+     lambda n: functools.reduce(operator.add, n, 0)),
+    ("for_list", flat,
+     lambda n: for_list([("n", n)], lambda n: n * 2),
+     lambda n: [x * 2 for x in n]),
+    ("for_set", flat,
+     lambda n: for_set([("n", n)], lambda n: n % 1000),
+     lambda n: {x % 1000 for x in n}),
+    ("for_dict", flat,
+     lambda n: for_dict([("n", n)], lambda n: (n, n * n)),
+     lambda n: {x: x * x for x in n}),
+    ("for_tuple", flat,
+     lambda n: for_tuple([("n", n)], lambda n: n),
+     lambda n: tuple(x for x in n)),
+    ("for_generator", flat,
+     lambda n: list(for_generator([("n", n)], lambda n: n, when=lambda n: n % 2 == 0)),
+     lambda n: list(x for x in n if x % 2 == 0)),
+    ("for_and", flat,
+     lambda n: for_and([("n", n)], lambda n: n > 0),
+     lambda n: all(x > 0 for x in n)),
+    ("for_or", flat,
+     lambda n: for_or([("n", n)], lambda n: n < 0),
+     lambda n: any(x < 0 for x in n)),
+    ("for_sum", flat,
+     lambda n: for_sum([("n", n)], lambda n: n),
+     lambda n: sum(x for x in n)),
+    ("for_product", flat,
+     lambda n: for_product([("n", n)], lambda n: 1 if n % 2 else -1),
+     lambda n: math.prod(1 if x % 2 else -1 for x in n)),
+    ("for_first", flat,
+     lambda n: for_first([("n", n)], lambda n: n, when=lambda n: n < 0),
+     lambda n: next((x for x in n if x < 0), None)),
+    ("for_last", flat,
+     lambda n: for_last([("n", n)], lambda n: n),
+     lambda n: n[-1] if n else None),
+    ("for_fold_nest", grid,
+     lambda g: for_fold_nest([("sum", 0)], [("i", g[0]), ("j", g[1])], lambda sum, i, j: (sum + i * j,), result=lambda sum: sum),
+     lambda g: sum(i * j for i in g[0] for j in g[1])),
+    ("for_list_nest", grid,
+     lambda g: for_list_nest([("i", g[0]), ("j", g[1])], lambda i, j: (i, j)),
+     lambda g: [(i, j) for i in g[0] for j in g[1]]),
+    ("for_dict_nest", grid,
+     lambda g: for_dict_nest([("i", g[0]), ("j", g[1])], lambda i, j: ((i, j), i * j)),
+     lambda g: {(i, j): i * j for i in g[0] for j in g[1]}),
+    ("for_tuple_nest", grid,
+     lambda g: for_tuple_nest([("i", g[0]), ("j", g[1])], lambda i, j: i + j),
+     lambda g: tuple(i + j for i in g[0] for j in g[1])),
+    ("for_generator_nest", grid,
+     lambda g: list(for_generator_nest([("i", g[0]), ("j", g[1])], lambda i, j: i - j)),
+     lambda g: list(i - j for i in g[0] for j in g[1])),
+    ("for_and_nest", grid,
+     lambda g: for_and_nest([("i", g[0]), ("j", g[1])], lambda i, j: i + j > 0),
+     lambda g: all(i + j > 0 for i in g[0] for j in g[1])),
+    ("for_or_nest", grid,
+     lambda g: for_or_nest([("i", g[0]), ("j", g[1])], lambda i, j: i + j < 0),
+     lambda g: any(i + j < 0 for i in g[0] for j in g[1])),
+    ("for_sum_nest", grid,
+     lambda g: for_sum_nest([("i", g[0]), ("j", g[1])], lambda i, j: i * j),
+     lambda g: sum(i * j for i in g[0] for j in g[1])),
+    ("for_product_nest", grid,
+     lambda g: for_product_nest([("i", g[0]), ("j", g[1])], lambda i, j: 1 if (i + j) % 2 else -1),
+     lambda g: math.prod(1 if (i + j) % 2 else -1 for i in g[0] for j in g[1])),
+    ("for_first_nest", grid,
+     lambda g: for_first_nest([("i", g[0]), ("j", g[1])], lambda i, j: (i, j), when=lambda i, j: i + j < 0),
+     lambda g: next(((i, j) for i in g[0] for j in g[1] if i + j < 0), None)),
+    ("for_last_nest", grid,
+     lambda g: for_last_nest([("i", g[0]), ("j", g[1])], lambda i, j: (i, j)),
+     lambda g: [(i, j) for i in g[0] for j in g[1]][-1]),
 ]
 
-# Run benchmarks
-for name, func in benchmarks:
-    time_taken = timeit.timeit(func, number=100)
-    print(f"{name}: {time_taken:.6f} seconds (for 100 iterations)")
+def measure(function: Callable[[], Any], *, warmup: int, repeat: int, min_time: float) -> Dict[str, float]:
+    """
+    Times `function` after `warmup` calls. Each of the `repeat` samples runs it enough
+    times to last at least `min_time` seconds, and records the per-call time.
+    """
+    for _ in range(warmup):
+        function()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return {
+        "loops": loops,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+def run(names: List[str], sizes: List[int], *, warmup: int, repeat: int, min_time: float) -> Dict[str, Any]:
+    results = []
+    for name, make_data, comps_version, baseline in CASES:
+        if names and name not in names:
+            continue
+        for size in sizes:
+            data = make_data(size)
+            elements = len(data) if make_data is flat else len(data[0]) * len(data[1])
+            comps_stats = measure(lambda: comps_version(data), warmup=warmup, repeat=repeat, min_time=min_time)
+            base_stats = measure(lambda: baseline(data), warmup=warmup, repeat=repeat, min_time=min_time)
+            results.append({"name": name, "size": size, "elements": elements, "comps": comps_stats, "baseline": base_stats})
+            print(format_row(results[-1]), flush=True)
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "warmup": warmup,
+        "repeat": repeat,
+        "results": results,
+    }
+
+def format_row(row: Dict[str, Any]) -> str:
+    comps_median = row["comps"]["median"]
+    base_median = row["baseline"]["median"]
+    per_element = comps_median / max(row["elements"], 1) * 1e9
+    return (
+        f"{row['name']:<20} {row['size']:>9,} "
+        f"{comps_median * 1e3:>11.4f} ms ±{row['comps']['stdev'] * 1e3:>9.4f} "
+        f"{per_element:>9.1f} ns/el "
+        f"{base_median * 1e3:>11.4f} ms {comps_median / base_median:>7.2f}x"
+    )
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> int:
+    """
+    Prints the median change of every case present in both runs and returns the
+    number of regressions slower than `threshold` (a fraction, e.g. 0.1 for 10%).
+    """
+    before = {(row["name"], row["size"]): row for row in old["results"]}
+    regressions = 0
+    print(f"{'case':<20} {'size':>9} {'old ms':>11} {'new ms':>11} {'change':>8}")
+    for row in new["results"]:
+        key = (row["name"], row["size"])
+        if key not in before:
+            continue
+        old_median = before[key]["comps"]["median"]
+        new_median = row["comps"]["median"]
+        change = new_median / old_median - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{key[0]:<20} {key[1]:>9,} {old_median * 1e3:>11.4f} {new_median * 1e3:>11.4f} {change:>+8.1%}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cases", nargs="*", help="case names to run (default: all)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two JSON runs")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold for --compare")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as old_file, open(args.compare[1]) as new_file:
+            return 1 if compare(json.load(old_file), json.load(new_file), args.threshold) else 0
+
+    print(f"{'case':<20} {'size':>9} {'comps median':>14} {'stdev':>10} {'per element':>15} {'baseline':>14} {'ratio':>8}")
+    report = run(args.cases, args.sizes, warmup=args.warmup, repeat=args.repeat, min_time=args.min_time)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
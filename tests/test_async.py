@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from comps.async_engine import map_tasks
+from comps.async_for_first import async_for_first
+from comps.async_for_fold import async_for_fold
+from comps.async_for_generator import async_for_generator
+from comps.async_for_list import async_for_list
+from comps.async_for_or import async_for_or
+
+async def items(values):
+    for value in values:
+        yield value
+
+async def run_with(results):
+    return [value async for value in results]
+
+# Test Example 1: Results keep input order unless ordered=False
+def test_async_ordering():
+    async def slow_square(n):
+        await asyncio.sleep(0.05 if n == 0 else 0)
+        return n * n
+
+    async def unordered():
+        return [value async for value in async_for_generator([("n", range(4))], slow_square, concurrency=4, ordered=False)]
+
+    assert asyncio.run(async_for_list([("n", range(4))], slow_square, concurrency=4)) == [0, 1, 4, 9]
+    results = asyncio.run(unordered())
+    assert sorted(results) == [0, 1, 4, 9] and results[-1] == 0, "The slow element should come last."
+
+    # Plain and coroutine callables mix in a fold
+    async def is_even(n):
+        return n % 2 == 0
+
+    total = asyncio.run(async_for_fold([("total", 0)], [("n", items(range(6)))], lambda total, n: (total + n,), when=is_even))
+    assert total == {"total": 6}
+
+# Test Example 2: At most `concurrency` tasks run at once
+def test_async_concurrency_limit():
+    running = 0
+    peak = 0
+
+    async def work(n):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return n
+
+    assert asyncio.run(async_for_list([("n", range(20))], work, concurrency=3)) == list(range(20))
+    assert peak == 3, f"Peak concurrency was {peak}."
+
+# Test Example 3: The first hit cancels the outstanding checks
+def test_async_cancellation():
+    for search in (async_for_first, async_for_or):
+        started = []
+        cancelled = []
+
+        async def check(n):
+            started.append(n)
+            try:
+                await asyncio.sleep(0 if n <= 1 else 1)
+            except asyncio.CancelledError:
+                cancelled.append(n)
+                raise
+            return n == 1
+
+        async def run():
+            if search is async_for_first:
+                return await search([("n", range(100))], lambda n: n * 10, when=check, concurrency=4)
+            return await search([("n", range(100))], check, concurrency=4)
+
+        # Returns long before the slow checks would finish
+        result = asyncio.run(asyncio.wait_for(run(), timeout=0.5))
+        assert result == (10 if search is async_for_first else True)
+        assert len(started) <= 5, f"{search.__name__} started {len(started)} checks."
+        assert cancelled, f"{search.__name__} did not cancel the outstanding checks."
+
+# Test Example 4: A failing task cancels the others and raises at once
+def test_map_tasks_errors():
+    cancelled = []
+
+    async def work(n):
+        if n == 2:
+            raise RuntimeError("boom")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(asyncio.wait_for(run_with(map_tasks(items(range(10)), work, 4)), timeout=0.5))
+    assert sorted(cancelled) == [0, 1, 3], "Running tasks were not cancelled."
+
+    # Failure Path: the concurrency must be positive
+    with pytest.raises(ValueError, match="concurrency"):
+        asyncio.run(run_with(map_tasks(items([1]), work, 0)))
@@ -0,0 +1,38 @@
+import pickle
+import pytest
+from comps.comprehension_builder import ComprehensionBuilder
+from comps.operations import AddAccumulator, AddIterable, SetBody, SetResult
+
+def add_total(total, n):
+    return total + n
+
+def count(count):
+    return count + 1
+
+# Test Example 1: Compiled plans are reusable on new data and picklable
+def test_compiled_plan():
+    builder = (
+        ComprehensionBuilder()
+        >> AddAccumulator("total", 0)
+        >> AddAccumulator("count", 0)
+        >> AddIterable("n", [1, 2, 3])
+        >> SetBody(add_total)
+        >> SetBody(count)
+    )
+    assert builder.run() == {"total": 6, "count": 3}, "Builder run failed."
+
+    # Happy Path: the plan runs on the bound data and on new data
+    plan = builder.compile()
+    assert plan() == {"total": 6, "count": 3}
+    assert plan(n=range(10)) == {"total": 45, "count": 10}
+
+    # A pickled plan behaves the same
+    restored = pickle.loads(pickle.dumps(plan))
+    assert restored(n=[5, 5]) == {"total": 10, "count": 2}
+
+    # Custom result picks one accumulator
+    assert (builder >> SetResult("total")).compile()(n=[4]) == 4
+
+    # Failure Path: unknown iterable names are rejected
+    with pytest.raises(ValueError, match="Unknown iterable name: m"):
+        plan(m=[1])
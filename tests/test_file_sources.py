@@ -0,0 +1,61 @@
+import pickle
+import struct
+from comps.file_sources import in_fields, in_lines, in_records
+from comps.for_fold import for_fold
+from comps.for_last import for_last
+from comps.for_last_nest import for_last_nest
+from comps.for_list import for_list
+from comps.sequences import is_sliceable
+
+# Test Example 1: Lines, fields and records read from the map
+def test_file_sources(tmp_path):
+    text = tmp_path / "log.csv"
+    text.write_bytes(b"a,1\r\nbb,2\nccc,3")
+    assert for_list([("line", in_lines(text))], lambda line: line.nbytes) == [3, 4, 5]
+    assert for_list([("fields", in_fields(text, encoding="ascii"))], lambda fields: fields[1]) == ["1", "2", "3"]
+
+    binary = tmp_path / "points.bin"
+    binary.write_bytes(b"".join(struct.pack("<id", i, i / 2) for i in range(10)))
+    with in_records(binary, "<id") as records:
+        assert (len(records), records[3], len(records[2:5])) == (10, (3, 1.5), 3)
+        total = for_fold(
+            accumulators=[("total", 0.0)],
+            iterables=[("record", records)],
+            body=lambda total, record: (total + record[1],),
+            result=lambda total: total
+        )
+        assert total == 22.5
+        assert is_sliceable(records) and list(records[8:]) == [(8, 4.0), (9, 4.5)]
+        assert pickle.loads(pickle.dumps(records[1:3]))[0] == (1, 0.5)
+
+# Test Example 2: Sources passed straight to a loop are unmapped when it ends
+def test_file_sources_close(tmp_path):
+    text = tmp_path / "words.txt"
+    text.write_bytes(b"alpha\nbeta\ngamma\n")
+
+    lines = in_lines(text, encoding="ascii")
+    assert for_list([("line", lines)], lambda line: line.upper()) == ["ALPHA", "BETA", "GAMMA"]
+    assert lines._file is None, "The map of a finished iteration is still open."
+
+    # An iteration stopped early closes the map once it is discarded
+    iterator = iter(lines)
+    assert next(iterator) == "alpha"
+    iterator.close()
+    assert lines._file is None
+
+    # Inside a with block the map stays open across passes
+    with in_lines(text) as shared:
+        assert len(list(shared)) == len(list(shared))
+        assert shared._file is not None
+    assert shared._file is None
+
+    # for_last walks records from the end and unmaps them when it stops
+    binary = tmp_path / "values.bin"
+    binary.write_bytes(struct.pack("<5d", 1.0, 2.0, 3.0, 4.0, 5.0))
+    records = in_records(binary, "<d")
+    assert for_last([("record", records)], lambda record: record[0], when=lambda record: record[0] < 4) == 3.0
+    assert records._file is None, "The reverse scan left the file mapped."
+    assert for_last([("record", records), ("n", range(3))], lambda record, n: (record[0], n)) == (3.0, 2)
+    assert records._file is None, "The reverse scan of a prefix left the file mapped."
+    assert for_last_nest([("n", range(2)), ("record", records)], lambda n, record: (n, record[0])) == (1, 5.0)
+    assert records._file is None
@@ -0,0 +1,40 @@
+import pytest
+from comps.collector import collect_list, collect_tuple
+from comps.fold_state import FoldState
+
+# Test Example 1: Items pushed over time fold like for_fold
+def test_fold_state():
+    state = FoldState(
+        accumulators=[("total", 0), ("pairs", collect_list())],
+        variables=["key", "value"],
+        body=lambda total, key, value: (total + value, (key, value)),
+        when=lambda value: value > 0
+    )
+    state.feed([("a", 1), ("b", -5), ("c", 2)])
+    assert state.result() == {"total": 3, "pairs": [("a", 1), ("c", 2)]}
+
+    saved = state.snapshot()
+    state.send("d", 4)
+    assert state.result()["total"] == 7 and state.count == 4
+    assert saved.result() == {"total": 3, "pairs": [("a", 1), ("c", 2)]}
+    assert state.reset().result() == {"total": 0, "pairs": []}
+
+    # Failure Path: every item needs a value per variable
+    with pytest.raises(ValueError, match="a value for each of key, value"):
+        state.send("e")
+
+# Test Example 2: Results never expose the live accumulators
+def test_fold_state_results_are_isolated():
+    state = FoldState(
+        accumulators=[("xs", collect_list()), ("frozen", collect_tuple())],
+        variables=["n"],
+        body=lambda n: (n, n * 10)
+    )
+    state.feed([1, 2])
+    state.result()["xs"].append(99)
+    assert state.result() == {"xs": [1, 2], "frozen": (10, 20)}, "A result changed the fold."
+
+    # Unchanged state reuses the frozen values; the next item refreshes them
+    assert state.result()["frozen"] is state.result()["frozen"]
+    state.send(3)
+    assert state.result() == {"xs": [1, 2, 3], "frozen": (10, 20, 30)}
@@ -121,3 +121,310 @@ def test_custom_result():
             body=body,
             result=invalid_result
         )
+
+# Test Example 5: Callables only receive the names they take
+def test_callables_receive_only_their_names():
+    numbers = [1, 2, 3, 4, 5]
+
+    # Happy Path: `when` only takes the iteration variable, `body` takes everything
+    result = for_fold(
+        accumulators=[("sum", 0), ("count", 0)],
+        iterables=[("n", numbers)],
+        body=lambda sum, count, n: (sum + n, count + 1),
+        when=lambda n: n > 2,
+        result=lambda count, sum: (sum, count)
+    )
+    assert result == (12, 3), "Positional call path failed."
+
+    # **kwargs callables still see every bound name
+    def body(**kwargs):
+        return (kwargs["sum"] + kwargs["n"], kwargs["count"] + 1)
+
+    result = for_fold(
+        accumulators=[("sum", 0), ("count", 0)],
+        iterables=[("n", numbers)],
+        body=body
+    )
+    assert result == {"sum": 15, "count": 5}, "Keyword fallback path failed."
+
+    # Failure Path: body returns the wrong number of accumulator values
+    with pytest.raises(ValueError, match="a value for each accumulator"):
+        for_fold(
+            accumulators=[("sum", 0), ("count", 0)],
+            iterables=[("n", numbers)],
+            body=lambda sum, n: (sum + n,)
+        )
+
+# Test Example 5b: Setup is paid once per code object, not once per call
+def test_compiled_loops_are_reused(monkeypatch):
+    from comps import engine
+
+    def fold(limit):
+        return for_fold(
+            accumulators=[("sum", 0)],
+            iterables=[("n", range(limit))],
+            body=lambda sum, n: (sum + n,),
+            when=lambda n: n % 2 == 0
+        )
+
+    assert fold(5) == {"sum": 6}
+    # Fresh lambdas of the same expressions reuse the CallSpecs and the generated loop
+    monkeypatch.setattr(engine, "_inspect_spec", None)
+    monkeypatch.setattr(engine, "_build", None)
+    assert fold(7) == {"sum": 12}, "Second call inspected or generated again."
+
+# Test Example 6: Collector accumulators are updated in place
+def test_collector_accumulators():
+    from comps.collector import collect_list, collect_tuple, collect_dict
+    from comps.for_dict import for_dict
+    from comps.for_list import for_list
+    from comps.for_set import for_set
+    from comps.for_tuple import for_tuple
+
+    numbers = [1, 2, 3, 4]
+
+    # Happy Path: the body returns the item to collect next to a plain accumulator
+    result = for_fold(
+        accumulators=[("sum", 0), ("squares", collect_tuple()), ("lookup", collect_dict())],
+        iterables=[("n", numbers)],
+        body=lambda sum, n: (sum + n, n * n, (n, -n))
+    )
+    assert result == {"sum": 10, "squares": (1, 4, 9, 16), "lookup": {1: -1, 2: -2, 3: -3, 4: -4}}
+
+    # Dict updates may skip a collector on some elements
+    result = for_fold(
+        accumulators=[("evens", collect_list()), ("count", 0)],
+        iterables=[("n", numbers)],
+        body=lambda count, n: {"evens": n, "count": count + 1} if n % 2 == 0 else {"count": count + 1},
+        result=lambda evens, count: (evens, count)
+    )
+    assert result == ([2, 4], 4), "Partial collector updates failed."
+
+    # for_list and friends hide their collector, so **kwargs callables see the loop variables only
+    names = lambda **kwargs: tuple(kwargs)
+    assert for_list([("n", [1, 2])], names, when=lambda n: True) == [("n",), ("n",)]
+    assert for_list([("n", [1, 2])], names) == [("n",), ("n",)]
+    assert for_set([("n", [1, 2])], names) == {("n",)}
+    assert for_dict([("n", [1, 2])], lambda **kwargs: (kwargs["n"], tuple(kwargs))) == {1: ("n",), 2: ("n",)}
+    assert for_tuple([("n", [1, 2])], names, when=lambda **kwargs: "result" not in kwargs) == (("n",), ("n",))
+
+# Test Example 7: Parallel map-reduce with an associative combiner
+def _count_and_sum(count, total, n):
+    return (count + 1, total + n)
+
+def _merge_count_and_sum(left, right):
+    return (left[0] + right[0], left[1] + right[1])
+
+def test_parallel_fold_with_combine():
+    from concurrent.futures import ThreadPoolExecutor
+
+    numbers = list(range(1, 1001))
+
+    # Happy Path: chunks folded in a process pool match the serial result
+    result = for_fold(
+        accumulators=[("count", 0), ("total", 0)],
+        iterables=[("n", numbers)],
+        body=_count_and_sum,
+        combine=_merge_count_and_sum,
+        workers=2,
+        chunk_size=64
+    )
+    assert result == {"count": 1000, "total": 500500}, "Parallel fold happy path failed."
+
+    # Partial lists are concatenated in chunk order with a caller-supplied executor
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = for_fold(
+            accumulators=[("items", [])],
+            iterables=[("n", numbers)],
+            body=lambda items, n: (items + [n],),
+            when=lambda n: n % 7 == 0,
+            combine=lambda left, right: (left[0] + right[0],),
+            executor=executor,
+            chunk_size=10,
+            result=lambda items: items
+        )
+    assert result == [n for n in numbers if n % 7 == 0], "Parallel fold lost chunk order."
+
+    # Failure Path: workers without a combiner
+    with pytest.raises(ValueError, match="combine function"):
+        for_fold(
+            accumulators=[("count", 0), ("total", 0)],
+            iterables=[("n", numbers)],
+            body=_count_and_sum,
+            workers=2
+        )
+
+    # Failure Path: a lambda body cannot reach a process pool, and the call must not hang
+    with pytest.raises(TypeError, match="picklable"):
+        for_fold(
+            accumulators=[("total", 0)],
+            iterables=[("n", numbers)],
+            body=lambda total, n: (total + n,),
+            combine=lambda left, right: (left[0] + right[0],),
+            workers=2,
+            chunk_size=100
+        )
+
+# Test Example 8: Streaming nested clauses that depend on outer variables
+def test_nested_dependent_clauses():
+    import itertools
+    from comps.for_fold_nest import for_fold_nest
+    from comps.for_first_nest import for_first_nest
+
+    # Happy Path: pairs (i, j) with j < i, like Racket's for*
+    result = for_fold_nest(
+        accumulators=[("pairs", 0), ("sum", 0)],
+        iterables=[("i", range(5)), ("j", lambda i: range(i))],
+        body=lambda pairs, sum, i, j: (pairs + 1, sum + j),
+        result=lambda pairs, sum: (pairs, sum)
+    )
+    assert result == (10, 10), "Dependent nested clause failed."
+
+    # Infinite clauses are fine when the search stops early
+    first = for_first_nest(
+        iterables=[("i", itertools.count(1)), ("j", itertools.count())],
+        body=lambda i, j: (i, j),
+        when=lambda j: j == 3
+    )
+    assert first == (1, 3), "Streaming nested search failed."
+
+# Test Example 9: `when` predicates are pushed down to the outermost clause they need
+def test_nested_filter_pushdown():
+    from comps.for_fold_nest import for_fold_nest
+
+    inner_calls = []
+
+    def inner(i):
+        inner_calls.append(i)
+        return range(3)
+
+    result = for_fold_nest(
+        accumulators=[("count", 0)],
+        iterables=[("i", range(10)), ("j", inner)],
+        body=lambda count, i, j: (count + 1,),
+        when=[lambda i: i % 5 == 0, lambda i, j: j != i],
+        result=lambda count: count
+    )
+    assert result == 5, "Nested filters changed the result."
+    assert inner_calls == [0, 5], "Outer-only predicate was not pushed down."
+
+# Test Example 10: Opt-in loop instrumentation
+def test_loop_stats():
+    from comps.for_fold_nest import for_fold_nest
+    from comps.instrumentation import LoopStats
+
+    stats = LoopStats()
+    result = for_fold(
+        accumulators=[("sum", 0)],
+        iterables=[("n", iter(range(10)))],
+        body=lambda sum, n: (sum + n,),
+        when=lambda n: n % 2 == 0,
+        result=lambda sum: sum,
+        stats=stats
+    )
+    assert result == 20, "Instrumentation changed the result."
+    assert (stats.pulled, stats.when_calls, stats.rejected, stats.body_calls) == (10, 10, 5, 5)
+    assert sum(stats.body_histogram.values()) == 5
+    assert stats.total_ns >= stats.source_ns + stats.when_ns + stats.body_ns
+
+    # pulled counts bindings: zipped sources count once per pair, nested clauses once per combination
+    stats = LoopStats()
+    for_fold([("count", 0)], [("a", [1, 2, 3]), ("b", "xyz")], lambda count: (count + 1,), stats=stats)
+    assert stats.pulled == 3, "Zipped sources were counted per item."
+    stats = LoopStats()
+    for_fold_nest([("count", 0)], [("i", range(3)), ("j", lambda i: range(i))], lambda count: (count + 1,), stats=stats)
+    assert stats.pulled == 3
+
+# Test Example 11: Bounded memoization of pure body and when functions
+def test_memoized_body():
+    from comps.for_list import for_list
+    from comps.memo import Memo
+
+    calls = []
+
+    def expensive(key):
+        calls.append(key)
+        return key * 10
+
+    memo = Memo(maxsize=2)
+    keys = ["a", "b", "a", "a", "c", "b", ["unhashable"]]
+    result = for_list(
+        iterables=[("key", keys)],
+        body=lambda key: expensive(key) if isinstance(key, str) else None,
+        memo=memo
+    )
+    assert result == ["a" * 10, "b" * 10, "a" * 10, "a" * 10, "c" * 10, "b" * 10, None]
+    # "b" was evicted by "c" (least recently used), so it is computed again
+    assert calls == ["a", "b", "c", "b"], "LRU eviction order is wrong."
+    assert (memo.hits, memo.misses, memo.uncached, memo.evictions) == (2, 4, 1, 2)
+
+# Test Example 12: Batched body and when, called once per chunk of values
+def test_batched_body():
+    from comps.collector import collect_list
+    from comps.for_generator import for_generator
+    from comps.instrumentation import LoopStats
+    from comps.for_list import for_list
+
+    chunks = []
+
+    def squares(n):
+        chunks.append(len(n))
+        return [x * x for x in n]
+
+    result = for_list(
+        iterables=[("n", range(10))],
+        body=squares,
+        when=lambda n: [x % 2 == 0 for x in n],
+        batch_size=4
+    )
+    assert result == [0, 4, 16, 36, 64]
+    assert chunks == [2, 2, 1], "Body should be called once per filtered chunk."
+
+    result = for_fold(
+        accumulators=[("total", 0), ("large", collect_list())],
+        iterables=[("n", range(10))],
+        body=lambda total, n: (total + sum(n), [x for x in n if x > 6]),
+        batch_size=3
+    )
+    assert result == {"total": 45, "large": [7, 8, 9]}
+
+    # Failure Path: options a batched fold would silently ignore
+    stats = LoopStats()
+    for options in ({"stats": stats}, {"memo": True}, {"combine": lambda left, right: left, "workers": 2}):
+        with pytest.raises(ValueError, match="Batched folds cannot"):
+            for_fold([("total", 0)], [("n", range(10))], lambda total, n: (total + sum(n),), batch_size=2, **options)
+    with pytest.raises(ValueError, match="Batched folds cannot"):
+        for_list([("n", range(10))], squares, memo=True, batch_size=2)
+    with pytest.raises(ValueError, match="concurrency"):
+        for_generator([("n", range(10))], squares, concurrency=2, batch_size=2)
+
+# Test Example 13: Early termination with break_when and final_when
+def test_break_and_final():
+    from comps.for_fold_nest import for_fold_nest
+
+    pulled = []
+
+    def numbers():
+        for n in range(100):
+            pulled.append(n)
+            yield n
+
+    result = for_fold(
+        accumulators=[("count", 0)],
+        iterables=[("n", numbers())],
+        body=lambda count, n: (count + 1,),
+        when=lambda n: n % 2 == 0,
+        break_when=lambda count: count == 3,
+        result=lambda count: count
+    )
+    assert result == 3
+    assert pulled == [0, 1, 2, 3, 4, 5, 6], "The source should not be drained after the break."
+
+    result = for_fold_nest(
+        accumulators=[("pairs", ())],
+        iterables=[("i", range(3)), ("j", range(3))],
+        body=lambda pairs, i, j: (pairs + ((i, j),),),
+        final_when=lambda i, j: (i, j) == (1, 0),
+        result=lambda pairs: pairs
+    )
+    assert result == ((0, 0), (0, 1), (0, 2), (1, 0))
@@ -0,0 +1,37 @@
+import pytest
+from comps.for_fused import for_fused
+
+# Test Example 1: Several collectors fused into one pass
+def test_for_fused():
+    pulled = []
+
+    def numbers():
+        for n in range(1, 100):
+            pulled.append(n)
+            yield n
+
+    result = for_fused(
+        iterables=[("n", numbers())],
+        outputs=[
+            ("first_even", "first", lambda n: n, lambda n: n % 2 == 0),
+            ("any_big", "or", lambda n: n > 3),
+            ("all_small", "and", lambda n: n < 4, lambda n: n % 2 == 1),
+        ],
+        when=lambda n: n != 2
+    )
+    assert result == {"first_even": 4, "any_big": True, "all_small": False}
+    assert pulled == [1, 2, 3, 4, 5], "The loop should stop once every output is decided."
+
+    result = for_fused(
+        iterables=[("i", range(3)), ("j", range(3))],
+        outputs=[("total", "sum", lambda i, j: i * j), ("pairs", "tuple", lambda i, j: (i, j), lambda i, j: i == j)],
+        nested=True,
+        result=lambda total, pairs: (total, pairs)
+    )
+    assert result == (9, ((0, 0), (1, 1), (2, 2)))
+
+    # Failure Path: malformed outputs and unknown kinds are rejected
+    with pytest.raises(ValueError, match="Each output must be"):
+        for_fused([("n", [1])], [("total", "sum")])
+    with pytest.raises(ValueError, match="Unsupported collector kind for total: mean"):
+        for_fused([("n", [1])], [("total", "mean", lambda n: n)])
@@ -0,0 +1,37 @@
+import pytest
+from comps.for_group import Aggregation, for_group, merge_groups
+
+# Test Example 1: Hash-aggregate group-by with mergeable partial tables
+def test_for_group():
+    sales = [("north", 120), ("south", 80), ("north", 45), ("east", 200), ("south", 20)]
+    region = lambda sale: sale[0]
+    amount = lambda sale: sale[1]
+
+    assert for_group([("sale", sales)], key=region, value=amount, agg="sum") == {"north": 165, "south": 100, "east": 200}
+    assert for_group([("sale", sales)], key=region, agg="count", when=lambda sale: sale[1] > 50) == {"north": 1, "south": 1, "east": 1}
+    assert for_group([("sale", sales)], key=region, value=amount, agg="min", keys=["west", "east"]) == {"east": 200, "north": 45, "south": 20}
+    assert list(for_group([("sale", sales)], key=region, value=amount, keys=["west"])) == ["west", "north", "south", "east"]
+
+    spread = Aggregation(
+        (float("inf"), float("-inf")),
+        lambda state, value: (min(state[0], value), max(state[1], value)),
+        lambda left, right: (min(left[0], right[0]), max(left[1], right[1]))
+    )
+    left = for_group([("sale", sales[:2])], key=region, value=amount, agg=spread)
+    right = for_group([("sale", sales[2:])], key=region, value=amount, agg=spread)
+    whole = for_group([("sale", sales)], key=region, value=amount, agg=spread)
+    assert merge_groups(left, right, spread) == whole
+    assert merge_groups({"a": [1]}, {"b": [2], "a": [3]}) == {"a": [1, 3], "b": [2]}
+
+    # Aggregating into a merged table leaves both partial tables as they were
+    a, b = {0: [1]}, {1: [3]}
+    merged = merge_groups(a, b)
+    for_group([("n", [9, 8])], key=lambda n: n % 2, value=lambda n: n, table=merged)
+    assert merged == {0: [1, 8], 1: [3, 9]}
+    assert (a, b) == ({0: [1]}, {1: [3]}), "Merged tables share states with their inputs."
+
+    # Failure Path: no value function, and merging custom aggregations without a merge
+    with pytest.raises(ValueError, match="value function is required"):
+        for_group([("sale", sales)], key=region, agg="sum")
+    with pytest.raises(ValueError, match="needs a merge function"):
+        merge_groups(left, right, Aggregation(0, lambda state, value: state + value))
@@ -0,0 +1,42 @@
+from comps.for_last import for_last
+from comps.for_last_nest import for_last_nest
+
+# Test Example 1: for_last scans sequences from the end
+def test_for_last_reverse_scan():
+    calls = []
+
+    def body(n):
+        calls.append(n)
+        return n * 10
+
+    checked = []
+
+    def when(n):
+        checked.append(n)
+        return n % 3 == 0
+
+    assert for_last([("n", list(range(100)))], body, when=when) == 990
+    assert (calls, checked) == ([99], [99]), "The scan should start at the end and stop at the first match."
+
+    calls.clear()
+    assert for_last([("n", iter(range(100)))], body, when=lambda n: n < 50) == 490
+    assert calls == [49], "The forward scan should call body for the last match only."
+
+    assert for_last([("a", [1, 2, 3]), ("b", "xy")], lambda a, b: (a, b)) == (2, "y")
+    assert for_last_nest([("i", range(3)), ("j", "ab")], lambda i, j: (i, j), when=lambda i: i < 2) == (1, "b")
+
+    # Lookup tables that iterate their keys are not indexed by position: forward scan
+    class Lookup:
+        def __init__(self, table):
+            self.table = table
+
+        def __len__(self):
+            return len(self.table)
+
+        def __getitem__(self, key):
+            return self.table[key]
+
+        def __iter__(self):
+            return iter(self.table)
+
+    assert for_last([("key", Lookup({"a": 1, "b": 2}))], lambda key: key.upper()) == "B"
@@ -0,0 +1,19 @@
+from array import array
+from comps.collector import collect_array
+from comps.for_fold import for_fold
+from comps.for_vector import for_vector
+
+# Test Example 1: Packed numeric output
+def test_for_vector():
+    result = for_vector([("n", range(10))], lambda n: n * 0.5, when=lambda n: n < 4)
+    assert result == array("d", [0.0, 0.5, 1.0, 1.5])
+    assert for_vector([("n", range(100))], lambda n: n, dtype="i", length=3) == array("i", [0, 1, 2])
+    assert for_vector([("n", range(2))], lambda n: n, dtype="i", length=4, fill=-1) == array("i", [0, 1, -1, -1])
+
+    result = for_fold(
+        accumulators=[("squares", collect_array("q"))],
+        iterables=[("n", range(4))],
+        body=[lambda n: n * n],
+        result=lambda squares: squares
+    )
+    assert result == array("q", [0, 1, 4, 9])
@@ -0,0 +1,25 @@
+import itertools
+from comps.for_first_nest import for_first_nest
+from comps.sequences import in_product
+
+# Test Example 1: Random access and resumable iteration of nested products
+def test_product_random_access():
+    clauses = [list("abc"), range(4), [10, 20]]
+    product = in_product(*clauses)
+    combinations = list(itertools.product(*clauses))
+    assert len(product) == 24 and list(product) == combinations
+    assert [product[k] for k in (0, 13, -1)] == [combinations[0], combinations[13], combinations[-1]]
+    assert list(product[5:19]) == combinations[5:19]
+
+    iterator = product.iterate()
+    for _ in range(9):
+        next(iterator)
+    assert (iterator.position, iterator.progress) == (9, 9 / 24)
+    assert list(product.iterate(iterator.position)) == combinations[9:]
+
+    huge = [("i", range(10 ** 9)), ("j", range(10 ** 9))]
+    assert for_first_nest(huge, lambda i, j: (i, j), when=lambda j: j % 5 == 0, start=10 ** 17 + 1) == (10 ** 8, 5)
+
+    # The product of no clauses has exactly one, empty, combination
+    assert list(in_product()) == [()] and list(in_product()[1:]) == []
+    assert for_first_nest([], lambda: "hit", start=0) == for_first_nest([], lambda: "hit") == "hit"
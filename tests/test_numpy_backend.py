@@ -0,0 +1,76 @@
+import pytest
+from comps.for_and import for_and
+from comps.for_and_nest import for_and_nest
+from comps.for_or import for_or
+from comps.for_or_nest import for_or_nest
+from comps.for_product import for_product
+from comps.for_product_nest import for_product_nest
+from comps.for_sum import for_sum
+from comps.for_sum_nest import for_sum_nest
+
+np = pytest.importorskip("numpy")
+
+# Test Example 1: Reductions match the Python backend
+def test_numpy_reductions():
+    numbers = list(range(1, 11))
+
+    for backend in ("python", "numpy"):
+        assert for_sum([("n", numbers)], lambda n: n * n, when=lambda n: n % 2 == 0, backend=backend) == 220
+        assert for_product([("n", numbers[:5])], lambda n: n, backend=backend) == 120
+        assert for_and([("n", numbers)], lambda n: n > 0, backend=backend) is True
+        assert for_or([("n", numbers)], lambda n: n > 10, backend=backend) is False
+
+    # The body is called once, on whole arrays
+    calls = []
+
+    def body(n):
+        calls.append(n)
+        return n + 1
+
+    assert for_sum([("n", np.arange(5))], body, backend="numpy") == 15
+    assert len(calls) == 1 and isinstance(calls[0], np.ndarray)
+
+    # Zipped iterables are truncated to the shortest
+    assert for_sum([("a", [1, 2, 3]), ("b", [10, 20])], lambda a, b: a * b, backend="numpy") == 50
+
+# Test Example 2: Nested clauses form a broadcast grid
+def test_numpy_nest():
+    grid = [("i", range(1, 5)), ("j", range(1, 4))]
+
+    for backend in ("python", "numpy"):
+        assert for_sum_nest(grid, lambda i, j: i * j, when=lambda i, j: i != j, backend=backend) == 46
+        assert for_product_nest(grid, lambda i, j: i + j, when=lambda i, j: i + j < 5, backend=backend) == 1152
+        assert for_and_nest(grid, lambda i, j: i + j > 1, backend=backend) is True
+        assert for_or_nest(grid, lambda i, j: i * j == 12, backend=backend) is True
+        assert for_sum_nest(grid + [("k", [])], lambda i, j, k: i, backend=backend) == 0
+
+    # Each clause varies along its own axis
+    shapes = []
+
+    def body(i, j):
+        shapes.append((i.shape, j.shape))
+        return i - j
+
+    assert for_sum_nest(grid, body, backend="numpy") == 6
+    assert shapes == [((4, 1), (1, 3))]
+
+    # A list of predicates must all hold, as with the Python backend
+    whens = [lambda i: i % 2 == 0, lambda i, j: j < 3]
+    for backend in ("python", "numpy"):
+        assert for_sum_nest(grid, lambda i, j: i * j, when=whens, backend=backend) == 18
+        assert for_sum([("n", range(10))], lambda n: n, when=[lambda n: n > 2, lambda n: n < 6], backend=backend) == 12
+
+# Test Example 3: No bindings give the Python identities
+def test_numpy_empty():
+    for backend in ("python", "numpy"):
+        total = for_sum([("n", [])], lambda n: n, backend=backend)
+        assert total == 0 and type(total) is int, f"Empty sum differs for {backend}."
+        assert for_product([("n", [])], lambda n: n, backend=backend) == 1
+        assert for_and([("n", [])], lambda n: n, backend=backend) is True
+        assert for_or([("n", [])], lambda n: n, backend=backend) is False
+
+    # Failure Path: unknown backends and multi-dimensional iterables are rejected
+    with pytest.raises(ValueError, match="Unsupported backend"):
+        for_sum([("n", [1])], lambda n: n, backend="cupy")
+    with pytest.raises(ValueError, match="one-dimensional"):
+        for_sum([("n", np.ones((2, 2)))], lambda n: n, backend="numpy")
@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import Manager
+import time
+import pytest
+from comps.for_and import for_and
+from comps.for_first import for_first
+from comps.for_first_nest import for_first_nest
+from comps.for_or import for_or
+from comps.for_or_nest import for_or_nest
+
+# Test Example 1: Parallel speculative search keeps first-match semantics
+def _counted_hit(calls, n):
+    calls.append(n)
+    time.sleep(0.01)
+    return n == 0
+
+def test_parallel_search():
+    def slow_hit(n):
+        # Early shards are slow, so later hits finish first and must not win
+        if n < 50:
+            time.sleep(0.002)
+        return n % 40 == 39
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert for_first([("n", list(range(200)))], lambda n: n, when=slow_hit, executor=executor, shards=8) == 39
+        assert for_first([("n", range(200))], lambda n: n, when=lambda n: n < 0, executor=executor) is None
+        assert for_and([("n", range(1000))], lambda n: n != 777, executor=executor, shards=10) is False
+        grid = [("i", range(20)), ("j", range(20))]
+        assert for_first_nest(grid, lambda i, j: (i, j), when=lambda i, j: i * j == 42, executor=executor, shards=6) == (3, 14)
+        assert for_or_nest(grid, lambda i, j: i + j > 40, executor=executor) is False
+
+    # Running shards stop once the answer is known: sequentially each would scan 500 items
+    calls = []
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert for_first([("n", range(2000))], lambda n: n, when=partial(_counted_hit, calls), executor=executor, shards=4) == 0
+    assert len(calls) < 200, "Cancelled shards kept scanning."
+
+    with Manager() as manager:
+        calls = manager.list()
+        assert for_or([("n", range(2000))], partial(_counted_hit, calls), workers=4, shards=4) is True
+        # Running shards are not waited for, but they stop at their next poll
+        time.sleep(0.5)
+        assert len(calls) < 200, "Cancelled process shards kept scanning."
+
+    # Failure Path: a lambda predicate cannot reach an owned process pool
+    with pytest.raises(TypeError, match="picklable"):
+        for_first([("n", range(100))], lambda n: n, when=lambda n: n > 5, workers=2)
+
+    # Nested shards ship only the slices of the clauses they cover
+    submitted = []
+
+    class Recorder(ThreadPoolExecutor):
+        def submit(self, task, *args):
+            submitted.append(args[5])
+            return super().submit(task, *args)
+
+    outer = list(range(1000))
+    with Recorder(max_workers=2) as executor:
+        assert for_or_nest([("i", outer), ("j", range(10))], lambda i, j: i + j < 0, executor=executor, shards=4) is False
+    assert [sum(len(clauses[0]) for clauses in blocks) for blocks in submitted] == [250] * 4
@@ -0,0 +1,23 @@
+import pytest
+from comps.pipeline import Pipeline
+
+# Test Example 1: Lazy pipeline fused into one loop
+def test_pipeline():
+    lines = ["3 apples", "", "10 pears", "# note", "END", "5 figs"]
+    counts = (
+        Pipeline([("line", lines)])
+        .filter(lambda line: line and not line.startswith("#"))
+        .take_while(lambda line: line != "END")
+        .map(lambda line: int(line.split()[0]))
+    )
+    assert list(counts) == [3, 10]
+    assert (counts.sum(), counts.count(), counts.last()) == (13, 2, 10)
+
+    grid = Pipeline([("i", range(3)), ("j", range(3))], nested=True)
+    assert grid.filter(lambda i, j: i < j).flat_map(lambda i, j: (i, j)).to_list() == [0, 1, 0, 2, 1, 2]
+    assert grid.fold(lambda total, pair: total + pair[0] * pair[1], 0) == 9
+    assert grid.count() == 9 and grid.first() == (0, 0)
+
+    # Failure Path: unknown stages are rejected when the pipeline runs
+    with pytest.raises(ValueError, match="Unsupported pipeline stage: zip"):
+        Pipeline([("n", [1])], stages=(("zip", len),)).to_list()
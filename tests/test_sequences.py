@@ -0,0 +1,34 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import inspect
+from comps.for_fold import for_fold
+from comps.for_generator import for_generator
+from comps.for_list import for_list
+from comps.sequences import in_indexed, in_naturals, in_range, in_slice, in_value, is_sliceable
+
+# Test Example 1: Lazy sized sequences
+def test_sequences():
+    evens = in_range(0, 20, 2)
+    assert (len(evens), evens.stride, evens[3]) == (10, 2, 6)
+    assert list(evens[2:4]) == [4, 6]
+    assert in_indexed("abc")[-1] == (2, "c")
+    assert list(in_slice("abcdef", 1, None, 2)[1:]) == ["d", "f"]
+
+    generator = for_generator([("i", in_range(4)), ("n", in_naturals(1))], lambda i, n: i * n)
+    assert inspect.isgenerator(generator)
+    assert list(generator) == [0, 2, 6, 12]
+    assert for_list([("x", in_value(7)), ("i", in_range(3))], lambda x, i: x + i) == [7]
+
+    # Only sources whose slices are sources count as sliceable, so a deque is chunked by rows
+    assert is_sliceable([1]) and is_sliceable(in_range(3)) and not is_sliceable(deque([1]))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        total = for_fold(
+            accumulators=[("total", 0)],
+            iterables=[("n", deque(range(100)))],
+            body=lambda total, n: (total + n,),
+            combine=lambda left, right: (left[0] + right[0],),
+            executor=executor,
+            chunk_size=30,
+            result=lambda total: total
+        )
+    assert total == 4950
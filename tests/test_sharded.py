@@ -0,0 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import pytest
+from comps.for_dict_nest import for_dict_nest
+from comps.for_sum_nest import for_sum_nest
+from comps.sharded import product_shards, shard_clauses
+
+# Test Example 1: Sharded parallel nested loops over the product index space
+def test_sharded_nest():
+    sources = [list("abc"), range(4), [10, 20]]
+    for shards in (1, 5, 12, 50):
+        prefix, ranges = product_shards([3, 4, 2], shards)
+        combinations = [
+            combination
+            for shard in ranges
+            for clauses in shard_clauses(sources, prefix, shard)
+            for combination in itertools.product(*clauses)
+        ]
+        assert combinations == list(itertools.product(*sources)), f"Shards do not cover the product in order ({shards})."
+
+    # A shard carries only its part of the outer clause, not the whole clause list
+    prefix, ranges = product_shards([1000, 5], 10)
+    assert list(shard_clauses([list(range(1000)), list("abcde")], prefix, ranges[1])) == [[list(range(100, 200)), list("abcde")]]
+
+    grid = [("i", range(30)), ("j", range(20))]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        total = for_sum_nest(grid, lambda i, j: i * j, when=lambda i: i % 2, executor=executor, shards=7)
+        pairs = for_dict_nest(grid, lambda i, j: ((i, j), i - j), executor=executor)
+    assert total == sum(i * j for i in range(30) for j in range(20) if i % 2)
+    assert list(pairs) == [(i, j) for i in range(30) for j in range(20)]
+
+    # Failure Path: a lambda body cannot be sent to an owned process pool
+    with pytest.raises(TypeError, match="picklable"):
+        for_sum_nest([("i", range(3)), ("j", range(3))], lambda i, j: i * j, workers=2)
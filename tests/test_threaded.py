@@ -0,0 +1,67 @@
+import itertools
+import threading
+import time
+import pytest
+from comps.threaded import run_concurrently
+
+def delayed(value, seconds):
+    def call():
+        time.sleep(seconds)
+        return value
+    return call
+
+# Test Example 1: Results in input order, or as they complete
+def test_ordering():
+    calls = [delayed(0, 0.2), delayed(1, 0), delayed(2, 0), delayed(3, 0)]
+
+    assert list(run_concurrently(calls, 4)) == [0, 1, 2, 3], "Ordered results out of order."
+
+    unordered = list(run_concurrently(calls, 4, ordered=False))
+    assert sorted(unordered) == [0, 1, 2, 3]
+    assert unordered[-1] == 0, "The slow call should complete last."
+
+    # Failure Path: invalid pool sizes are rejected before any call runs
+    with pytest.raises(ValueError, match="concurrency"):
+        list(run_concurrently(calls, 0))
+    with pytest.raises(ValueError, match="buffer_size"):
+        list(run_concurrently(calls, 4, buffer_size=2))
+
+# Test Example 2: An infinite source is pulled only as far as the buffer allows
+def test_bounded_buffer():
+    pulled = []
+
+    def calls():
+        for i in itertools.count():
+            pulled.append(i)
+            yield delayed(i, 0)
+
+    for ordered in (True, False):
+        pulled.clear()
+        results = run_concurrently(calls(), 2, ordered=ordered, buffer_size=4)
+        first = list(itertools.islice(results, 10))
+        if ordered:
+            assert first == list(range(10))
+        else:
+            assert len(set(first)) == 10 and max(first) < 10 + 4
+        assert len(pulled) <= 10 + 4, f"Pulled {len(pulled)} calls for 10 results."
+        results.close()
+
+# Test Example 3: Closing the consumer early shuts the pool down
+def test_early_close_shuts_down():
+    threads = threading.active_count()
+    started = []
+
+    def call(i):
+        started.append(i)
+        time.sleep(0.01)
+        return i
+
+    results = run_concurrently(((lambda i=i: call(i)) for i in range(1000)), 2)
+    assert next(results) == 0
+    results.close()
+
+    count = len(started)
+    time.sleep(0.05)
+    assert len(started) == count, "Calls kept starting after close."
+    assert count < 1000
+    assert threading.active_count() == threads, "Pool threads are still alive."